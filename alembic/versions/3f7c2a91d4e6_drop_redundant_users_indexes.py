@@ -0,0 +1,56 @@
+"""drop redundant users email/username indexes
+
+Revision ID: 3f7c2a91d4e6
+Revises: 9d1d7e6a58b2
+Create Date: 2026-10-15 21:55:04.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7c2a91d4e6'
+down_revision: str | Sequence[str] | None = '9d1d7e6a58b2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+UNIQUE_COLUMNS = ("email", "username")
+
+# batch 模式在 SQLite 上按反射结果重建表，UUID 会被反射成 NUMERIC，这里显式指定
+_REFLECT_ARGS = [sa.Column("id", sa.Uuid(), primary_key=True)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # create_tables() 按 unique=True, index=True 建出的是唯一索引 ix_users_*，
+    # 没有单独的唯一约束；先补上模型中的唯一约束，再删除索引，避免丢失唯一性
+    existing = {
+        tuple(c["column_names"])
+        for c in sa.inspect(op.get_bind()).get_unique_constraints("users")
+    }
+    missing = [column for column in UNIQUE_COLUMNS if (column,) not in existing]
+    if missing:
+        # SQLite 不支持 ALTER TABLE ADD CONSTRAINT，batch 模式下会重建表
+        with op.batch_alter_table("users", reflect_args=_REFLECT_ARGS) as batch_op:
+            for column in missing:
+                batch_op.create_unique_constraint(f"users_{column}_key", [column])
+
+    # 唯一约束自带索引，活跃用户按邮箱查询走部分索引 users_email_active_key，
+    # 按 id 查询走主键，ix_users_* 只增加写入开销
+    op.drop_index("ix_users_email", table_name="users", if_exists=True)
+    op.drop_index("ix_users_username", table_name="users", if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ix_users_username", "users", ["username"], unique=True, if_not_exists=True
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True, if_not_exists=True)
+    with op.batch_alter_table("users", reflect_args=_REFLECT_ARGS) as batch_op:
+        for column in UNIQUE_COLUMNS:
+            batch_op.drop_constraint(f"users_{column}_key", type_="unique")
@@ -0,0 +1,40 @@
+"""replace posts soft-delete indexes with a partial index
+
+Revision ID: 5b8e1c0d7a43
+Revises: 3f7c2a91d4e6
+Create Date: 2026-10-15 22:05:12.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1c0d7a43'
+down_revision: str | Sequence[str] | None = '3f7c2a91d4e6'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # is_deleted 几乎恒为 false，普通索引区分度低且增加写入开销；
+    # 查询默认只读未删除的行，改为只覆盖这些行的部分索引
+    op.drop_index("ix_posts_is_deleted", table_name="posts", if_exists=True)
+    op.drop_index("ix_posts_deleted_at", table_name="posts", if_exists=True)
+    op.create_index(
+        "ix_posts_live",
+        "posts",
+        ["created_at"],
+        postgresql_where=sa.text("is_deleted = false"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_posts_live", table_name="posts", if_exists=True)
+    op.create_index("ix_posts_deleted_at", "posts", ["deleted_at"], if_not_exists=True)
+    op.create_index("ix_posts_is_deleted", "posts", ["is_deleted"], if_not_exists=True)
@@ -0,0 +1,54 @@
+"""add trigram indexes for post search
+
+Revision ID: 8d2f4a6b9c10
+Revises: 5b8e1c0d7a43
+Create Date: 2026-10-15 22:40:37.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4a6b9c10'
+down_revision: str | Sequence[str] | None = '5b8e1c0d7a43'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SEARCH_COLUMNS = ("title", "content", "summary")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm 仅 PostgreSQL 可用，与模型中的 ddl_if(dialect="postgresql") 一致
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # 文章搜索是 ILIKE '%词%'，前导通配符只能顺序扫描；
+    # pg_trgm 的 GIN 索引可以直接支持这种 ILIKE，查询语句无需改动
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # 正文列上的 GIN 索引构建较慢，CONCURRENTLY 不阻塞写入，但不能在事务中执行
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.create_index(
+                f"ix_posts_{column}_trgm",
+                "posts",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.drop_index(
+                f"ix_posts_{column}_trgm",
+                table_name="posts",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
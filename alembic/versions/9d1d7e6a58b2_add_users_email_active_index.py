@@ -0,0 +1,49 @@
+"""add users is_active and active email index
+
+Revision ID: 9d1d7e6a58b2
+Revises: 0a9c3e5d1f27
+Create Date: 2026-10-15 10:12:31.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9d1d7e6a58b2'
+down_revision: str | Sequence[str] | None = '0a9c3e5d1f27'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 通过 create_tables() 建表的数据库可能已经包含该列
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("users")}
+    if "is_active" not in columns:
+        op.add_column(
+            "users",
+            sa.Column(
+                "is_active",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.true(),
+            ),
+        )
+
+    op.create_index(
+        "users_email_active_key",
+        "users",
+        ["email"],
+        unique=True,
+        postgresql_where=sa.text("is_active = true"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("users_email_active_key", table_name="users", if_exists=True)
+    op.drop_column("users", "is_active")
@@ -0,0 +1,53 @@
+"""add users created_at / updated_at
+
+Revision ID: b7e4d2a91c36
+Revises: 8d2f4a6b9c10
+Create Date: 2026-10-16 09:20:14.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4d2a91c36'
+down_revision: str | Sequence[str] | None = '8d2f4a6b9c10'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # User 与其他模型一样使用 AuditableModel 的时间戳列；
+    # 通过 create_tables() 建表的数据库可能已经包含这两列
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("users")}
+    if "created_at" not in columns:
+        # 已有用户的创建时间无从得知，回填为迁移时刻
+        op.add_column(
+            "users",
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+                comment="创建时间",
+            ),
+        )
+    if "updated_at" not in columns:
+        op.add_column(
+            "users",
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=True,
+                comment="更新时间",
+            ),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "updated_at")
+    op.drop_column("users", "created_at")
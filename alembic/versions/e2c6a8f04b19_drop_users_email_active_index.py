@@ -0,0 +1,37 @@
+"""drop users active email partial index
+
+Revision ID: e2c6a8f04b19
+Revises: b7e4d2a91c36
+Create Date: 2026-10-16 11:05:42.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c6a8f04b19'
+down_revision: str | Sequence[str] | None = 'b7e4d2a91c36'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # email 已有全局唯一约束 users_email_key，部分唯一索引不会多拦截任何数据，
+    # 只增加每次写入的索引维护开销
+    op.drop_index("users_email_active_key", table_name="users", if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "users_email_active_key",
+        "users",
+        ["email"],
+        unique=True,
+        postgresql_where=sa.text("is_active = true"),
+        if_not_exists=True,
+    )
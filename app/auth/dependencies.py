@@ -1,10 +1,13 @@
 """Auth 模块的依赖项"""
 
+from typing import Annotated
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User
+from app.auth.schemas import TokenData
 from app.auth.service import AuthService
 from app.database.session import get_db
 
@@ -12,26 +15,32 @@
 security = HTTPBearer()
 
 
-async def get_current_user(
+async def get_token_data(
     credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> TokenData:
+    """校验访问令牌
+
+    独立于数据库会话之前解析，令牌无效时直接拒绝，不再创建会话、
+    也不会进入请求体的 Pydantic 校验
+    """
+    from app.auth.exceptions import AuthenticationError
+
+    token_data = AuthService.verify_token(credentials.credentials)
+    if token_data is None:
+        raise AuthenticationError("Could not validate credentials")
+    return token_data
+
+
+async def get_current_user(
+    token_data: TokenData = Depends(get_token_data),
     db: AsyncSession = Depends(get_db),
 ) -> User:
     """获取当前用户"""
     from app.auth.exceptions import AuthenticationError
 
     try:
-        # 验证令牌
-        token_data = AuthService.verify_token(credentials.credentials)
-        if token_data is None:
-            raise AuthenticationError("Could not validate credentials")
-
-        # 查询用户
-        from sqlalchemy import select
-
-        result = await db.execute(
-            select(User).where(User.id == token_data.user_id, User.is_active == True)
-        )
-        user = result.scalar_one_or_none()
+        # 查询用户（短时间内命中缓存）
+        user = await AuthService.get_active_user(db, token_data.user_id)
 
         if user is None:
             raise AuthenticationError("User not found")
@@ -69,18 +78,25 @@ class PermissionChecker:
     """权限检查器"""
 
     def __init__(self, required_permissions: list):
-        self.required_permissions = required_permissions
+        self.required_permissions = frozenset(required_permissions)
+        # 构造时确定是否需要检查，无权限要求时直接放行
+        self._has_required = bool(self.required_permissions)
 
-    def __call__(self, current_user: User = Depends(get_current_active_user)):
+    async def __call__(self, current_user: User = Depends(get_current_active_user)):
         from app.auth.exceptions import InsufficientPermissionsError
 
-        # 这里可以实现更复杂的权限检查逻辑
+        if not self._has_required or current_user.is_superuser:
+            return current_user
+
+        # 这里可以实现更复杂的权限检查逻辑（如与用户权限集合做子集判断）
         # 目前简单检查是否为超级用户
-        if not current_user.is_superuser and self.required_permissions:
-            raise InsufficientPermissionsError("Insufficient permissions")
-        return current_user
+        raise InsufficientPermissionsError("Insufficient permissions")
 
 
 # 常用权限检查依赖
 require_superuser = PermissionChecker(["admin"])
 require_user = PermissionChecker(["user"])
+
+# 常用依赖的类型别名，路由中直接用作参数注解
+CurrentUser = Annotated[User, Depends(get_current_active_user)]
+CurrentSuperuser = Annotated[User, Depends(require_superuser)]
@@ -1,24 +1,34 @@
 from sqlalchemy import Boolean, Column, DateTime, String
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import expression
 
-from app.models import BaseModel
+from app.models import AuditableModel, BaseModel
 
 
-class User(BaseModel):
+class User(AuditableModel, BaseModel):
     """用户模型"""
 
     __tablename__ = "users"
 
-    email = Column(String(255), unique=True, nullable=False, index=True)
-    username = Column(String(50), unique=True, nullable=False, index=True)
+    # 唯一约束自带索引，无需再单独建普通索引
+    email = Column(String(255), unique=True, nullable=False)
+    username = Column(String(50), unique=True, nullable=False)
     full_name = Column(String(100), nullable=True)
     hashed_password = Column(String(255), nullable=False)
+    is_active = Column(
+        Boolean, default=True, nullable=False, server_default=expression.true()
+    )
     is_superuser = Column(Boolean, default=False)
     is_verified = Column(Boolean, default=False)
     last_login = Column(DateTime(timezone=True), nullable=True)
 
-    # 关系
-    posts = relationship("Post", back_populates="author", cascade="all, delete-orphan")
+    # 关系（禁止隐式懒加载，需要时使用 selectinload(User.posts) 显式预加载）
+    posts = relationship(
+        "Post",
+        back_populates="author",
+        lazy="raise_on_sql",
+        cascade="all, delete-orphan",
+    )
 
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, username={self.username})>"
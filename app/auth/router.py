@@ -3,16 +3,24 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependencies import get_current_active_user
+from app.auth.dependencies import CurrentUser
 from app.auth.models import User
-from app.auth.schemas import UserCreate, UserLogin, UserResponse, UserUpdate
-from app.auth.service import AuthService
-from app.core.decorators import handle_exceptions, handle_response
+from app.auth.schemas import (
+    UserCreate,
+    UserLogin,
+    UserResponse,
+    UserResponseList,
+    UserUpdate,
+)
+from app.auth.service import AuthService, last_login_recorder
+from app.core.decorators import handle_response
 from app.core.logging import get_logger
 from app.database.session import get_db
+from app.posts.service import PostService
 from app.utils.pagination import QueryParams, get_paginated_results
 
 logger = get_logger("api")
@@ -21,23 +29,19 @@
 
 @router.post("/register", response_model=dict, summary="用户注册")
 @handle_response("用户注册成功")
-@handle_exceptions()
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """用户注册"""
     from app.auth.exceptions import UserAlreadyExistsError
 
-    # 检查邮箱是否已存在
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    if result.scalar_one_or_none():
-        raise UserAlreadyExistsError("Email already registered")
-
-    # 检查用户名是否已存在
-    result = await db.execute(select(User).where(User.username == user_data.username))
-    if result.scalar_one_or_none():
-        raise UserAlreadyExistsError("Username already taken")
+    # 检查邮箱和用户名是否已存在
+    await AuthService.check_user_conflict(
+        db, email=user_data.email, username=user_data.username
+    )
 
-    # 创建新用户
-    hashed_password = AuthService.get_password_hash(user_data.password)
+    # 创建新用户（密码哈希为 CPU 密集操作，放入线程池避免阻塞事件循环）
+    hashed_password = await run_in_threadpool(
+        AuthService.get_password_hash, user_data.password
+    )
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -46,17 +50,24 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     )
 
     db.add(db_user)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # 并发注册时由唯一索引兜底
+        await db.rollback()
+        raise UserAlreadyExistsError("User already exists")
     await db.refresh(db_user)
 
-    logger.info(f"New user registered: {user_data.email}")
+    logger.info("New user registered: {}", user_data.email)
     return UserResponse.model_validate(db_user)
 
 
 @router.post("/login", response_model=dict, summary="用户登录")
 @handle_response("登录成功")
-@handle_exceptions()
-async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
+async def login(
+    user_data: UserLogin,
+    db: AsyncSession = Depends(get_db),
+):
     """用户登录"""
     from app.auth.exceptions import InvalidCredentialsError
 
@@ -64,6 +75,9 @@ async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
     if not user:
         raise InvalidCredentialsError("Incorrect email or password")
 
+    # 最后登录时间由后台任务批量写回，不占用登录的关键路径
+    last_login_recorder.record(user.id)
+
     access_token = AuthService.create_access_token(
         data={"sub": str(user.id), "username": user.username}
     )
@@ -78,62 +92,58 @@ async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
 
 @router.get("/me", response_model=dict, summary="获取当前用户信息")
 @handle_response()
-@handle_exceptions()
-async def get_current_user_info(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_info(current_user: CurrentUser):
     """获取当前用户信息"""
     return UserResponse.model_validate(current_user)
 
 
 @router.put("/me", response_model=dict, summary="更新当前用户信息")
 @handle_response("用户信息更新成功")
-@handle_exceptions()
 async def update_current_user(
+    current_user: CurrentUser,
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """更新当前用户信息"""
     from app.auth.exceptions import UserAlreadyExistsError
 
-    # 检查邮箱是否已被其他用户使用
-    if user_data.email and user_data.email != current_user.email:
-        result = await db.execute(
-            select(User).where(
-                User.email == user_data.email, User.id != current_user.id
-            )
-        )
-        if result.scalar_one_or_none():
-            raise UserAlreadyExistsError("Email already registered")
-
-    # 检查用户名是否已被其他用户使用
-    if user_data.username and user_data.username != current_user.username:
-        result = await db.execute(
-            select(User).where(
-                User.username == user_data.username, User.id != current_user.id
-            )
-        )
-        if result.scalar_one_or_none():
-            raise UserAlreadyExistsError("Username already taken")
+    # 检查邮箱和用户名是否已被其他用户使用
+    await AuthService.check_user_conflict(
+        db,
+        email=user_data.email if user_data.email != current_user.email else None,
+        username=(
+            user_data.username
+            if user_data.username != current_user.username
+            else None
+        ),
+        exclude_user_id=current_user.id,
+    )
 
     # 更新用户信息
     update_data = user_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(current_user, field, value)
 
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise UserAlreadyExistsError("User already exists")
+    AuthService.invalidate_user_cache(current_user.id)
     await db.refresh(current_user)
+    # 文章缓存中包含作者信息
+    await PostService.invalidate_author_posts(db, current_user.id)
 
-    logger.info(f"User updated: {current_user.email}")
+    logger.info("User updated: {}", current_user.email)
     return UserResponse.model_validate(current_user)
 
 
 @router.get("/users", response_model=dict, summary="获取用户列表")
 @handle_response()
-@handle_exceptions()
 async def get_users(
+    current_user: CurrentUser,
     params: QueryParams = Depends(),
     search: str | None = Query(None, description="搜索邮箱或用户名"),
-    current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """获取用户列表（需要登录）"""
@@ -155,24 +165,24 @@ async def get_users(
     )
 
     return {
-        "items": [UserResponse.model_validate(user) for user in result["items"]],
+        "items": UserResponseList.validate_python(
+            result["items"], from_attributes=True
+        ),
         "meta": result["meta"],
     }
 
 
 @router.get("/users/{user_id}", response_model=dict, summary="获取用户详情")
 @handle_response()
-@handle_exceptions()
 async def get_user(
+    current_user: CurrentUser,
     user_id: UUID,
-    current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """获取用户详情"""
     from app.auth.exceptions import UserNotFoundError
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
 
     if not user:
         raise UserNotFoundError("User not found")
@@ -1,7 +1,11 @@
+import re
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, field_validator
+
+# 密码强度：至少 8 位，包含大写字母、小写字母和数字
+_PASSWORD_RE = re.compile(r"^(?=.*[A-Z])(?=.*[a-z])(?=.*\d).{8,}$", re.DOTALL)
 
 
 class UserBase(BaseModel):
@@ -18,6 +22,9 @@ class UserCreate(UserBase):
     @field_validator('password')
     @classmethod
     def validate_password(cls, v):
+        if _PASSWORD_RE.match(v):
+            return v
+        # 校验未通过时再逐项检查，给出具体的错误提示
         if len(v) < 8:
             raise ValueError('密码长度至少 8 位')
         if not any(c.isupper() for c in v):
@@ -45,13 +52,17 @@ class UserResponse(UserBase):
     is_verified: bool
     is_superuser: bool
     created_at: datetime
-    updated_at: datetime
+    updated_at: datetime | None = None
     last_login: datetime | None = None
 
     class Config:
         from_attributes = True
 
 
+# 列表响应适配器，模块级构建一次供各请求复用
+UserResponseList = TypeAdapter(list[UserResponse])
+
+
 class UserLogin(BaseModel):
     """用户登录模型"""
     email: EmailStr = Field(..., description="邮箱")
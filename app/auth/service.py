@@ -1,21 +1,130 @@
 """Auth 模块的服务层"""
 
+import asyncio
+import base64
+import contextlib
+import hashlib
+import hmac
 import logging
+import time
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
-from jose import JWTError, jwt
+import bcrypt
+import jwt
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from jwt.exceptions import PyJWTError as JWTError
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.auth.exceptions import UserAlreadyExistsError
 from app.auth.models import User
 from app.auth.schemas import TokenData
 from app.core.config import settings
+from app.database.session import AsyncSessionLocal
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger("auth")
 security_settings = settings.security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated=["bcrypt"],
+    argon2__type="ID",
+    argon2__memory_cost=security_settings.argon2_memory_cost,
+    argon2__time_cost=security_settings.argon2_time_cost,
+    argon2__parallelism=security_settings.argon2_parallelism,
+    bcrypt__rounds=security_settings.bcrypt_rounds,
+)
+
+# bcrypt 哈希前缀，命中时直接调用 bcrypt 校验，跳过 passlib 的 scheme 分发
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+# bcrypt 只使用密码的前 72 字节，与 passlib 的截断行为保持一致
+_BCRYPT_MAX_BYTES = 72
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    """无填充的 base64url 编码（JWT 格式）"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# HS256 签名所用的固定头部与密钥，启动时计算一次
+_HS256_HEADER = _b64url_encode(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+_HS256_KEY = security_settings.secret_key.encode()
+
+# JWT 配置启动后不再变化，绑定为模块常量，避免热路径上逐层读取配置
+_SECRET_KEY = security_settings.secret_key
+_ALGORITHM = security_settings.algorithm
+_ALGORITHMS = [_ALGORITHM]
+_DECODE_OPTIONS = {"require": ["exp", "sub"]}
+_USE_HS256_FAST_PATH = _ALGORITHM == "HS256"
+_ACCESS_TOKEN_EXPIRE_SECONDS = security_settings.access_token_expire_minutes * 60
+
+
+def _encode_hs256(payload: dict) -> str:
+    """使用预计算的头部和密钥签发 HS256 令牌"""
+    signing_input = _HS256_HEADER + b"." + _b64url_encode(orjson.dumps(payload))
+    signature = hmac.new(_HS256_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url_encode(signature)).decode()
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    """补齐填充后进行 base64url 解码"""
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _decode_hs256(token: str) -> dict:
+    """校验并解析本服务签发的 HS256 令牌
+
+    仅处理头部与 _HS256_HEADER 完全一致的令牌，其余交给 PyJWT 处理
+    """
+    raw = token.encode()
+    signing_input, _, signature = raw.rpartition(b".")
+    header, _, payload = signing_input.partition(b".")
+    if header != _HS256_HEADER or not payload or b"." in payload:
+        return jwt.decode(
+            token, _SECRET_KEY, algorithms=["HS256"], options=_DECODE_OPTIONS
+        )
+
+    expected = hmac.new(_HS256_KEY, signing_input, hashlib.sha256).digest()
+    if not hmac.compare_digest(_b64url_encode(expected), signature):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+
+    try:
+        claims = orjson.loads(_b64url_decode(payload))
+    except ValueError as e:
+        raise jwt.DecodeError("Invalid payload string") from e
+    if not isinstance(claims, dict):
+        raise jwt.DecodeError("Invalid payload string: must be a json object")
+
+    exp = claims.get("exp")
+    if exp is None:
+        raise jwt.MissingRequiredClaimError("exp")
+    if not isinstance(exp, int | float):
+        raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.")
+    if exp <= time.time():
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    return claims
+
+
+# 已验证令牌缓存，条目在令牌自身 exp 到期时失效
+_token_cache = TTLCache(maxsize=security_settings.token_cache_size)
+# 缓存键使用由签名密钥派生的带密钥哈希，外部无法构造或预测缓存键
+_TOKEN_CACHE_KEY = hashlib.sha256(b"token-cache:" + _HS256_KEY).digest()
+
+
+def _token_cache_key(token: str) -> bytes:
+    """令牌缓存键（避免在内存中保存原始令牌）"""
+    return hashlib.blake2b(
+        token.encode(), digest_size=16, key=_TOKEN_CACHE_KEY
+    ).digest()
+
+
+# 活跃用户缓存，保存列值快照而非 ORM 实例，避免跨会话共享对象
+_user_cache = TTLCache(maxsize=10_000, ttl=security_settings.user_cache_ttl)
+_USER_COLUMNS = tuple(User.__table__.columns.keys())
 
 
 class AuthService:
@@ -24,6 +133,11 @@ class AuthService:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """验证密码"""
+        if hashed_password.startswith(_BCRYPT_PREFIXES):
+            return bcrypt.checkpw(
+                plain_password.encode("utf-8")[:_BCRYPT_MAX_BYTES],
+                hashed_password.encode("utf-8"),
+            )
         return pwd_context.verify(plain_password, hashed_password)
 
     @staticmethod
@@ -35,32 +149,39 @@ def get_password_hash(password: str) -> str:
     def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
         """创建访问令牌"""
         to_encode = data.copy()
-        if expires_delta:
-            expire = datetime.now(UTC) + expires_delta
-        else:
-            expire = datetime.now(UTC) + timedelta(
-                minutes=security_settings.access_token_expire_minutes
-            )
-
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(
-            to_encode,
-            security_settings.secret_key,
-            algorithm=security_settings.algorithm,
+        # exp 只需要整数时间戳，直接用 time.time() 计算，不构造 datetime
+        expires_in = (
+            expires_delta.total_seconds()
+            if expires_delta
+            else _ACCESS_TOKEN_EXPIRE_SECONDS
         )
+        to_encode["exp"] = int(time.time() + expires_in)
+        if _USE_HS256_FAST_PATH:
+            encoded_jwt = _encode_hs256(to_encode)
+        else:
+            encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=_ALGORITHM)
 
-        logger.info(f"Access token created for user: {data.get('sub')}")
+        logger.info("Access token created for user: %s", data.get("sub"))
         return encoded_jwt
 
     @staticmethod
     def verify_token(token: str) -> TokenData | None:
         """验证令牌"""
+        cache_key = _token_cache_key(token)
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            payload = jwt.decode(
-                token,
-                security_settings.secret_key,
-                algorithms=[security_settings.algorithm],
-            )
+            if _USE_HS256_FAST_PATH:
+                payload = _decode_hs256(token)
+            else:
+                payload = jwt.decode(
+                    token,
+                    _SECRET_KEY,
+                    algorithms=_ALGORITHMS,
+                    options=_DECODE_OPTIONS,
+                )
             user_id: str = payload.get("sub")
             username: str = payload.get("username")
 
@@ -68,15 +189,70 @@ def verify_token(token: str) -> TokenData | None:
                 logger.warning("Token missing required fields")
                 return None
 
-            return TokenData(user_id=UUID(user_id), username=username)
+            token_data = TokenData(user_id=UUID(user_id), username=username)
+            expires_at = payload.get("exp")
+            if expires_at is not None:
+                _token_cache.set(cache_key, token_data, expires_at=float(expires_at))
+            return token_data
 
         except JWTError as e:
-            logger.warning(f"JWT verification failed: {e}")
+            logger.warning("JWT verification failed: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Token verification error: {e}")
+            logger.error("Token verification error: %s", e)
             return None
 
+    @staticmethod
+    async def get_active_user(db: AsyncSession, user_id: UUID) -> User | None:
+        """获取活跃用户，短时间内命中缓存时不查询数据库"""
+        snapshot = _user_cache.get(user_id)
+        if snapshot is not None:
+            # 由快照重建实例并以已持久化状态并入当前会话，不发出 SQL
+            user = User(**snapshot)
+            make_transient_to_detached(user)
+            return await db.merge(user, load=False)
+
+        result = await db.execute(
+            select(User).where(User.id == user_id, User.is_active.is_(True))
+        )
+        user = result.scalar_one_or_none()
+        if user is not None:
+            _user_cache.set(
+                user_id, {key: getattr(user, key) for key in _USER_COLUMNS}
+            )
+        return user
+
+    @staticmethod
+    def invalidate_user_cache(user_id: UUID) -> None:
+        """用户信息变更后清除缓存"""
+        _user_cache.pop(user_id)
+
+    @staticmethod
+    async def check_user_conflict(
+        db: AsyncSession,
+        email: str | None = None,
+        username: str | None = None,
+        exclude_user_id: UUID | None = None,
+    ) -> None:
+        """检查邮箱或用户名是否已被占用（单次查询）"""
+        conditions = []
+        if email:
+            conditions.append(User.email == email)
+        if username:
+            conditions.append(User.username == username)
+        if not conditions:
+            return
+
+        query = select(User.email, User.username).where(or_(*conditions))
+        if exclude_user_id is not None:
+            query = query.where(User.id != exclude_user_id)
+
+        rows = (await db.execute(query)).all()
+        if email and any(row.email == email for row in rows):
+            raise UserAlreadyExistsError("Email already registered")
+        if username and any(row.username == username for row in rows):
+            raise UserAlreadyExistsError("Username already taken")
+
     @staticmethod
     async def authenticate_user(
         db: AsyncSession, email: str, password: str
@@ -84,25 +260,111 @@ async def authenticate_user(
         """验证用户"""
         try:
             result = await db.execute(
-                select(User).where(User.email == email, User.is_active is True)
+                select(User).where(User.email == email, User.is_active.is_(True))
             )
             user = result.scalar_one_or_none()
 
             if not user:
-                logger.warning(f"User not found: {email}")
+                logger.warning("User not found: %s", email)
                 return None
 
-            if not AuthService.verify_password(password, user.hashed_password):
-                logger.warning(f"Invalid password for user: {email}")
+            # 密码校验为 CPU 密集操作，放入线程池避免阻塞事件循环
+            password_ok = await run_in_threadpool(
+                AuthService.verify_password, password, user.hashed_password
+            )
+            if not password_ok:
+                logger.warning("Invalid password for user: %s", email)
                 return None
 
-            # 更新最后登录时间
-            user.last_login = datetime.now(UTC)
-            await db.commit()
+            # 旧的 bcrypt 哈希或参数与当前配置不一致的哈希透明地重新哈希，
+            # 随 get_db 的提交一并写回
+            if pwd_context.needs_update(user.hashed_password):
+                user.hashed_password = await run_in_threadpool(
+                    AuthService.get_password_hash, password
+                )
+                AuthService.invalidate_user_cache(user.id)
 
-            logger.info(f"User authenticated successfully: {email}")
+            logger.info("User authenticated successfully: %s", email)
             return user
 
         except Exception as e:
-            logger.error(f"Authentication error: {e}")
+            logger.error("Authentication error: %s", e)
             return None
+
+
+class LastLoginRecorder:
+    """最后登录时间批量写入器
+
+    登录时只在内存中记录，后台任务定期（或累计到 batch_size 条时）
+    以一次批量 UPDATE 写回，登录请求不再等待数据库写入
+    """
+
+    def __init__(self, batch_size: int = 100, interval: float = 1.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        # 同一用户多次登录只保留最新时间（时间戳，写回时再转换为 datetime）
+        self._pending: dict[UUID, float] = {}
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def record(self, user_id: UUID) -> None:
+        """记录一次登录"""
+        self._pending[user_id] = time.time()
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """将待写入的登录时间批量写回数据库"""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        try:
+            async with AsyncSessionLocal() as session:
+                # ORM 按主键批量更新，单条语句 executemany 执行
+                await session.execute(
+                    update(User),
+                    [
+                        {
+                            "id": user_id,
+                            "last_login": datetime.fromtimestamp(last_login, UTC),
+                        }
+                        for user_id, last_login in pending.items()
+                    ],
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error("Update last login error: %s", e)
+            return
+
+        for user_id in pending:
+            AuthService.invalidate_user_cache(user_id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """启动后台写入任务"""
+        if self._task is None:
+            # 事件需在运行中的事件循环内创建
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台写入任务并写回剩余记录"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+
+
+last_login_recorder = LastLoginRecorder()
@@ -1,9 +1,10 @@
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jwt.exceptions import PyJWTError as JWTError
 from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,7 +16,11 @@
 from app.database.session import get_db
 
 logger = get_logger("auth")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.security.bcrypt_rounds,
+)
 security = HTTPBearer()
 
 
@@ -37,9 +42,9 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
         """创建访问令牌"""
         to_encode = data.copy()
         if expires_delta:
-            expire = datetime.now(timezone.UTC) + expires_delta
+            expire = datetime.now(UTC) + expires_delta
         else:
-            expire = datetime.now(timezone.UTC) + timedelta(
+            expire = datetime.now(UTC) + timedelta(
                 minutes=settings.access_token_expire_minutes
             )
 
@@ -48,7 +53,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
             to_encode, settings.secret_key, algorithm=settings.algorithm
         )
 
-        logger.info(f"Access token created for user: {data.get('sub')}")
+        logger.info("Access token created for user: {}", data.get("sub"))
         return encoded_jwt
 
     @staticmethod
@@ -68,10 +73,10 @@ def verify_token(token: str) -> TokenData | None:
             return TokenData(user_id=UUID(user_id), username=username)
 
         except JWTError as e:
-            logger.warning(f"JWT verification failed: {e}")
+            logger.warning("JWT verification failed: {}", e)
             return None
         except Exception as e:
-            logger.error(f"Token verification error: {e}")
+            logger.error("Token verification error: {}", e)
             return None
 
     @staticmethod
@@ -81,27 +86,27 @@ async def authenticate_user(
         """验证用户"""
         try:
             result = await db.execute(
-                select(User).where(User.email == email, User.is_active)
+                select(User).where(User.email == email, User.is_active.is_(True))
             )
             user = result.scalar_one_or_none()
 
             if not user:
-                logger.warning(f"User not found: {email}")
+                logger.warning("User not found: {}", email)
                 return None
 
             if not AuthService.verify_password(password, user.hashed_password):
-                logger.warning(f"Invalid password for user: {email}")
+                logger.warning("Invalid password for user: {}", email)
                 return None
 
             # 更新最后登录时间
-            user.last_login = datetime.now(timezone.UTC)
+            user.last_login = datetime.now(UTC)
             await db.commit()
 
-            logger.info(f"User authenticated successfully: {email}")
+            logger.info("User authenticated successfully: {}", email)
             return user
 
         except Exception as e:
-            logger.error(f"Authentication error: {e}")
+            logger.error("Authentication error: {}", e)
             return None
 
 
@@ -124,18 +129,20 @@ async def get_current_user(
 
         # 查询用户
         result = await db.execute(
-            select(User).where(User.id == token_data.user_id, User.is_active is True)
+            select(User).where(
+                User.id == token_data.user_id, User.is_active.is_(True)
+            )
         )
         user = result.scalar_one_or_none()
 
         if user is None:
-            logger.warning(f"User not found for token: {token_data.user_id}")
+            logger.warning("User not found for token: {}", token_data.user_id)
             raise credentials_exception
 
         return user
 
     except Exception as e:
-        logger.error(f"Get current user error: {e}")
+        logger.error("Get current user error: {}", e)
         raise credentials_exception
 
 
@@ -164,7 +171,7 @@ class PermissionChecker:
     def __init__(self, required_permissions: list):
         self.required_permissions = required_permissions
 
-    def __call__(self, current_user: User = Depends(get_current_active_user)):
+    async def __call__(self, current_user: User = Depends(get_current_active_user)):
         # 这里可以实现更复杂的权限检查逻辑
         # 目前简单检查是否为超级用户
         if not current_user.is_superuser and self.required_permissions:
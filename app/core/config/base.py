@@ -1,11 +1,23 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, PydanticBaseSettingsSource
 
 
 class BaseConfig(BaseSettings):
-    """基础配置类，包含通用的配置逻辑"""
+    """基础配置类，包含通用的配置逻辑
+
+    环境变量与 .env 由 Settings 统一读取一次并按 env_prefix 分组后传入，
+    配置类本身只负责校验
+    """
 
     class Config:
-        env_file = ".env"
-        case_sensitive = False
-        env_file_encoding = "utf-8"
         extra = "ignore"
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (init_settings,)
@@ -1,3 +1,5 @@
+import json
+
 from pydantic import field_validator
 
 from .base import BaseConfig
@@ -6,11 +8,13 @@
 class CorsConfig(BaseConfig):
     """CORS 配置"""
 
-    # 允许的主机
-    allowed_hosts: list[str] = ["localhost", "127.0.0.1", "0.0.0.0"]
+    # 允许的主机（加载时统一转小写并转为 frozenset，请求时 O(1) 查找）
+    allowed_hosts: frozenset[str] = frozenset({"localhost", "127.0.0.1", "0.0.0.0"})
 
     # 允许的 HTTP 方法
-    allowed_methods: list[str] = ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"]
+    allowed_methods: frozenset[str] = frozenset(
+        {"GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"}
+    )
 
     # 允许的请求头
     allowed_headers: list[str] = ["*"]
@@ -20,8 +24,22 @@ class CorsConfig(BaseConfig):
     def parse_list(cls, v):
         """解析字符串列表"""
         if isinstance(v, str):
+            if v.lstrip().startswith("["):
+                return json.loads(v)
             return [item.strip() for item in v.split(",")]
         return v
 
+    @field_validator("allowed_hosts", mode="after")
+    @classmethod
+    def normalize_hosts(cls, v: frozenset[str]) -> frozenset[str]:
+        """主机名不区分大小写"""
+        return frozenset(host.lower() for host in v)
+
+    @field_validator("allowed_methods", mode="after")
+    @classmethod
+    def normalize_methods(cls, v: frozenset[str]) -> frozenset[str]:
+        """HTTP 方法统一为大写"""
+        return frozenset(method.upper() for method in v)
+
     class Config:
         env_prefix = "CORS_"
@@ -7,5 +7,10 @@ class RedisConfig(BaseConfig):
     # Redis 连接 URL
     redis_url: str = "redis://localhost:6379/0"
 
+    # 连接池配置（每个 worker 进程独立一个连接池）
+    max_connections: int = 64
+    # 连接池耗尽时等待可用连接的秒数
+    pool_timeout: int = 5
+
     class Config:
         env_prefix = "REDIS_"
@@ -1,3 +1,5 @@
+from pydantic import Field
+
 from .base import BaseConfig
 
 
@@ -9,5 +11,19 @@ class SecurityConfig(BaseConfig):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    # 当前用户缓存时间（秒），0 表示每个请求都查询数据库
+    user_cache_ttl: int = Field(15, ge=0)
+
+    # 已验证令牌的缓存条目数，0 表示每个请求都重新校验签名
+    token_cache_size: int = Field(10_000, ge=0)
+
+    # 密码哈希配置（新哈希使用 Argon2id，参数取 OWASP 推荐的最低值）
+    argon2_memory_cost: int = Field(19456, ge=8, description="内存开销（KiB）")
+    argon2_time_cost: int = Field(2, ge=1)
+    argon2_parallelism: int = Field(1, ge=1)
+
+    # 旧的 bcrypt 哈希仍可校验，登录成功后自动升级为 Argon2id
+    bcrypt_rounds: int = Field(12, ge=4, le=31)
+
     class Config:
         env_prefix = "SECURITY_"
@@ -1,4 +1,10 @@
+import os
+from functools import cached_property
+
+from dotenv import dotenv_values
+
 from .app import AppConfig
+from .base import BaseConfig
 from .cors import CorsConfig
 from .database import DatabaseConfig
 from .files import FileConfig
@@ -6,116 +12,116 @@
 from .redis import RedisConfig
 from .security import SecurityConfig
 
+_CONFIG_CLASSES = (
+    AppConfig,
+    SecurityConfig,
+    DatabaseConfig,
+    RedisConfig,
+    CorsConfig,
+    LoggingConfig,
+    FileConfig,
+)
+
 
 class Settings:
-    """配置聚合器，统一管理所有配置"""
-
-    def __init__(self):
-        # 每个配置类独立加载，避免环境变量冲突
-        self.app = AppConfig(_env_file=".env")
-        self.security = SecurityConfig(_env_file=".env")
-        self.database = DatabaseConfig(_env_file=".env")
-        self.redis = RedisConfig(_env_file=".env")
-        self.cors = CorsConfig(_env_file=".env")
-        self.logging = LoggingConfig(_env_file=".env")
-        self.files = FileConfig(_env_file=".env")
-
-    # 为了向后兼容，提供一些属性的直接访问
-    @property
-    def app_name(self) -> str:
-        return self.app.app_name
-
-    @property
-    def app_version(self) -> str:
-        return self.app.app_version
-
-    @property
-    def debug(self) -> bool:
-        return self.app.debug
-
-    @property
-    def environment(self) -> str:
-        return self.app.environment
-
-    @property
-    def is_production(self) -> bool:
-        return self.app.is_production
-
-    @property
-    def is_development(self) -> bool:
-        return self.app.is_development
-
-    @property
-    def is_testing(self) -> bool:
-        return self.app.is_testing
-
-    @property
-    def secret_key(self) -> str:
-        return self.security.secret_key
-
-    @property
-    def algorithm(self) -> str:
-        return self.security.algorithm
-
-    @property
-    def access_token_expire_minutes(self) -> int:
-        return self.security.access_token_expire_minutes
-
-    @property
-    def database_url(self) -> str:
-        return self.database.database_url
-
-    @property
-    def test_database_url(self) -> str:
-        return self.database.test_database_url
-
-    @property
-    def redis_url(self) -> str:
-        return self.redis.redis_url
-
-    @property
-    def allowed_hosts(self) -> list[str]:
-        return self.cors.allowed_hosts
-
-    @property
-    def allowed_methods(self) -> list[str]:
-        return self.cors.allowed_methods
-
-    @property
-    def allowed_headers(self) -> list[str]:
-        return self.cors.allowed_headers
-
-    @property
-    def log_level(self) -> str:
-        return self.logging.log_level
-
-    @property
-    def log_format(self) -> str:
-        return self.logging.log_format
-
-    @property
-    def max_file_size(self) -> int:
-        return self.files.max_file_size
-
-    @property
-    def upload_dir(self) -> str:
-        return self.files.upload_dir
-
-    @property
-    def rate_limit_requests(self) -> int:
-        return self.app.rate_limit_requests
-
-    @property
-    def rate_limit_window(self) -> int:
-        return self.app.rate_limit_window
-
-    @property
-    def app_host(self) -> str:
-        return self.app.app_host
-
-    @property
-    def app_port(self) -> int:
-        return self.app.app_port
+    """配置聚合器，统一管理所有配置
+
+    各领域配置在首次访问时才加载，环境变量和 .env 文件只读取一次
+    """
+
+    def __init__(self, env_file: str | None = ".env"):
+        # 环境变量和 .env 只读取一次（环境变量优先），按各配置组的前缀分组
+        environ: dict[str, str] = {}
+        if env_file and os.path.isfile(env_file):
+            environ.update(
+                (key.lower(), value)
+                for key, value in dotenv_values(env_file, encoding="utf-8").items()
+                if value is not None
+            )
+        environ.update((key.lower(), value) for key, value in os.environ.items())
+
+        prefixes = [
+            config_cls.model_config.get("env_prefix", "").lower()
+            for config_cls in _CONFIG_CLASSES
+        ]
+        self._env: dict[str, dict[str, str]] = {prefix: {} for prefix in prefixes}
+        for key, value in environ.items():
+            for prefix in prefixes:
+                if key.startswith(prefix):
+                    self._env[prefix][key[len(prefix):]] = value
+                    break
+
+    def _load(self, config_cls: type[BaseConfig]) -> BaseConfig:
+        """使用已分组的环境变量构建配置"""
+        prefix = config_cls.model_config.get("env_prefix", "").lower()
+        return config_cls(**self._env[prefix])
+
+    @cached_property
+    def app(self) -> AppConfig:
+        return self._load(AppConfig)
+
+    @cached_property
+    def security(self) -> SecurityConfig:
+        return self._load(SecurityConfig)
+
+    @cached_property
+    def database(self) -> DatabaseConfig:
+        return self._load(DatabaseConfig)
+
+    @cached_property
+    def redis(self) -> RedisConfig:
+        return self._load(RedisConfig)
+
+    @cached_property
+    def cors(self) -> CorsConfig:
+        return self._load(CorsConfig)
+
+    @cached_property
+    def logging(self) -> LoggingConfig:
+        return self._load(LoggingConfig)
+
+    @cached_property
+    def files(self) -> FileConfig:
+        return self._load(FileConfig)
+
+    # 为了向后兼容，提供一些属性的直接访问：属性名 -> 所属配置组
+    _COMPAT_FIELDS = {
+        "app_name": "app",
+        "app_version": "app",
+        "debug": "app",
+        "environment": "app",
+        "is_production": "app",
+        "is_development": "app",
+        "is_testing": "app",
+        "secret_key": "security",
+        "algorithm": "security",
+        "access_token_expire_minutes": "security",
+        "database_url": "database",
+        "test_database_url": "database",
+        "redis_url": "redis",
+        "allowed_hosts": "cors",
+        "allowed_methods": "cors",
+        "allowed_headers": "cors",
+        "log_level": "logging",
+        "log_format": "logging",
+        "max_file_size": "files",
+        "upload_dir": "files",
+        "rate_limit_requests": "app",
+        "rate_limit_window": "app",
+        "app_host": "app",
+        "app_port": "app",
+    }
+
+    def __getattr__(self, name: str):
+        group = self._COMPAT_FIELDS.get(name)
+        if group is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        value = getattr(getattr(self, group), name)
+        # 配置加载后不再变化，缓存为实例属性，后续访问不再经过 __getattr__
+        self.__dict__[name] = value
+        return value
 
 
 # 全局配置实例
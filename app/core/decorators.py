@@ -1,11 +1,12 @@
+import time
 import traceback
 from collections.abc import Callable
-from datetime import datetime, timezone
 from functools import wraps
 from typing import Any
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Response, status
 
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.schemas import ApiResponse, ErrorCode, ErrorResponse
 
@@ -48,35 +49,37 @@ async def wrapper(*args, **kwargs):
                     response_data["message"] = success_message
 
                 response = ApiResponse(**response_data)
-                api_logger.info(
-                    f"API success: {func.__name__}",
-                    extra={
+                # lazy=True：日志级别未启用时不执行参数的字符串化
+                api_logger.opt(lazy=True).info(
+                    "API success: {}",
+                    lambda: func.__name__,
+                    extra=lambda: {
                         "function": func.__name__,
                         "args": str(args),
                         "kwargs": str(kwargs),
                     },
                 )
 
-                return response
+                # 由 pydantic 直接序列化为 JSON，跳过 FastAPI 的
+                # model_dump -> 校验 -> jsonable_encoder 多轮转换
+                return Response(
+                    content=response.model_dump_json(),
+                    media_type="application/json",
+                )
 
             except HTTPException as e:
-                # 处理 HTTP 异常
-                error_response = ErrorResponse(
-                    error=error_code or ErrorCode.BAD_REQUEST,
-                    message=e.detail,
-                    details={"status_code": e.status_code},
-                )
+                # HTTP 异常原样抛出，保留状态码，由全局异常处理器统一格式
                 api_logger.warning(
-                    f"HTTP Exception: {func.__name__} - {e.detail}",
+                    "HTTP Exception: {} - {}",
+                    func.__name__,
+                    e.detail,
                     extra={
                         "function": func.__name__,
                         "status_code": e.status_code,
                         "detail": e.detail,
                     },
                 )
-                raise HTTPException(
-                    status_code=e.status_code, detail=error_response.model_dump()
-                )
+                raise
 
             except ValueError as e:
                 # 处理值错误
@@ -86,7 +89,9 @@ async def wrapper(*args, **kwargs):
                     details={"function": func.__name__},
                 )
                 api_logger.warning(
-                    f"Validation error: {func.__name__} - {str(e)}",
+                    "Validation error: {} - {}",
+                    func.__name__,
+                    e,
                     extra={"function": func.__name__, "error": str(e)},
                 )
                 raise HTTPException(
@@ -103,16 +108,23 @@ async def wrapper(*args, **kwargs):
                         "function": func.__name__,
                         "error_type": type(e).__name__,
                         "error_message": str(e),
-                        "traceback": traceback.format_exc() if not error_code else None,
+                        # 仅调试模式下在响应中返回堆栈
+                        "traceback": (
+                            traceback.format_exc()
+                            if settings.debug and not error_code
+                            else None
+                        ),
                     },
                 )
-                api_logger.error(
-                    f"Internal error: {func.__name__} - {str(e)}",
+                # 堆栈交给日志器在实际输出时再格式化
+                api_logger.opt(exception=e).error(
+                    "Internal error: {} - {}",
+                    func.__name__,
+                    e,
                     extra={
                         "function": func.__name__,
                         "error_type": type(e).__name__,
                         "error_message": str(e),
-                        "traceback": traceback.format_exc(),
                     },
                 )
                 raise HTTPException(
@@ -157,16 +169,19 @@ async def wrapper(*args, **kwargs):
                         "function": func.__name__,
                         "error_type": type(e).__name__,
                         "error_message": str(e),
-                        "traceback": traceback.format_exc(),
+                        "traceback": (
+                            traceback.format_exc() if settings.debug else None
+                        ),
                     },
                 )
-                api_logger.error(
-                    f"Internal error: {func.__name__} - {str(e)}",
+                api_logger.opt(exception=e).error(
+                    "Internal error: {} - {}",
+                    func.__name__,
+                    e,
                     extra={
                         "function": func.__name__,
                         "error_type": type(e).__name__,
                         "error_message": str(e),
-                        "traceback": traceback.format_exc(),
                     },
                 )
                 raise HTTPException(
@@ -193,7 +208,8 @@ def success(
             "data": data,
             "success": True,
             "message": message,
-            "timestamp": datetime.now(timezone.UTC),
+            # Unix 时间戳（秒），由 JSON 编码器直接输出，不构造 datetime
+            "timestamp": time.time(),
         }
         return response, status_code
 
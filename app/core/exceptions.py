@@ -4,7 +4,7 @@
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import ValidationError as PydanticValidationError
 
 from app.core.error import BaseAppError, ValidationError
@@ -19,7 +19,7 @@ async def app_error_handler(
         exc: BaseAppError,
     ):
         """处理自定义应用程序异常"""
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content=exc.to_dict(),
         )
@@ -27,7 +27,7 @@ async def app_error_handler(
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(
         _request: Request, exc: RequestValidationError
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """处理 FastAPI 请求验证异常"""
         errors = []
         for error in exc.errors():
@@ -42,7 +42,7 @@ async def validation_exception_handler(
             message="请求参数验证失败", details={"errors": errors}
         )
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=validation_error.status_code, content=validation_error.to_dict()
         )
 
@@ -50,7 +50,7 @@ async def validation_exception_handler(
     async def pydantic_validation_handler(
         _request: Request,
         exc: PydanticValidationError,
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """处理 Pydantic 验证异常"""
         validation_error = ValidationError(
             message="数据验证失败",
@@ -58,7 +58,7 @@ async def pydantic_validation_handler(
                 "errors": exc.errors(),
             },
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=validation_error.status_code,
             content=validation_error.to_dict(),
         )
@@ -67,21 +67,31 @@ async def pydantic_validation_handler(
     async def http_exception_handler(
         _request: Request,
         exc: HTTPException,
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """处理 FastAPI 的 HTTPException
 
         将标准 HTTPException 转换为统一错误响应格式
         """
-        error = {
-            "code": str(exc.status_code),
-            "message": exc.detail,
-        }
+        detail = exc.detail
+        if isinstance(detail, dict):
+            # 模块异常（如 AuthException）的 detail 已包含错误代码和消息
+            error = {
+                "code": detail.get("error", str(exc.status_code)),
+                "message": detail.get("message", ""),
+            }
+            if detail.get("details"):
+                error["details"] = detail["details"]
+        else:
+            error = {
+                "code": str(exc.status_code),
+                "message": detail,
+            }
 
         headers = getattr(exc, "headers", None)
         if headers:
             error["details"] = {"headers": headers}
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=exc.status_code,
             content={"error": error},
             headers=headers,
@@ -91,7 +101,7 @@ async def http_exception_handler(
     async def uncaught_exception_handler(
         _request: Request,
         exc: Exception,
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """处理所有未分类的异常"""
         error = {
             "code": "internal_server_error",
@@ -102,7 +112,7 @@ async def uncaught_exception_handler(
             },
         }
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": error},
         )
@@ -5,20 +5,52 @@
 
 from app.core.config import settings
 
+# 标准库日志级别名 -> loguru 级别（未注册的级别回退为数值）
+_LEVEL_CACHE: dict[str, str | int] = {}
+
+# 标准库 logger 名 -> 调用方相对 emit 的栈深度
+_DEPTH_CACHE: dict[str, int] = {}
+
+# 所有 loguru sink 中最低的级别，低于它的记录任何 sink 都不会输出
+_min_level_no = 0
+
 
 class InterceptHandler(logging.Handler):
     """拦截标准日志处理器"""
 
     def emit(self, record):
+        # 会被所有 sink 丢弃的记录直接返回，省去取栈帧和格式化消息
+        if record.levelno < _min_level_no:
+            return
+
+        level = _LEVEL_CACHE.get(record.levelname)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            _LEVEL_CACHE[record.levelname] = level
+
+        logging_file = logging.__file__
+        # 同一 logger 的调用栈层数基本固定，先用缓存的深度直接取帧校验：
+        # 该帧的下一层仍在 logging 模块内、该帧本身已不在，才说明命中调用方
+        depth = _DEPTH_CACHE.get(record.name)
         try:
-            level = logger.level(record.levelname).name
+            inner = sys._getframe(depth - 1) if depth is not None else None
         except ValueError:
-            level = record.levelno
-
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back
-            depth += 1
+            inner = None
+        if (
+            inner is None
+            or inner.f_code.co_filename != logging_file
+            or inner.f_back is None
+            or inner.f_back.f_code.co_filename == logging_file
+        ):
+            # 未命中时按栈逐层跳过 logging 模块内的帧
+            frame, depth = sys._getframe(1), 1
+            while frame.f_back and frame.f_code.co_filename == logging_file:
+                frame = frame.f_back
+                depth += 1
+            _DEPTH_CACHE[record.name] = depth
 
         logger.opt(depth=depth, exception=record.exc_info).log(
             level, record.getMessage()
@@ -27,6 +59,8 @@ def emit(self, record):
 
 def setup_logging():
     """设置日志配置"""
+    global _min_level_no
+
     # 移除默认的日志处理器
     logger.remove()
 
@@ -41,6 +75,8 @@ def setup_logging():
         colorize=True,
         backtrace=True,
         diagnose=True,
+        # 生产环境经后台线程写出，请求路径不阻塞在 stdout 上
+        enqueue=settings.is_production,
     )
 
     # 添加文件日志处理器（仅在生产环境）
@@ -52,6 +88,7 @@ def setup_logging():
             format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}",
             level=settings.log_level,
             compression="zip",
+            enqueue=True,
         )
 
     # 添加错误日志文件
@@ -62,8 +99,12 @@ def setup_logging():
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}",
         level="ERROR",
         compression="zip",
+        enqueue=True,
     )
 
+    # 控制台 sink 的级别最低（错误日志文件只收 ERROR 及以上）
+    _min_level_no = logger.level(settings.log_level).no
+
     # 拦截标准库的日志
     logging.basicConfig(
         handlers=[InterceptHandler()],
@@ -88,6 +129,11 @@ def setup_logging():
             logging_logger.setLevel(settings.log_level)
 
 
+async def flush_logging():
+    """等待队列中的日志全部写出（应用关闭时调用）"""
+    await logger.complete()
+
+
 def get_logger(name: str):
     """获取指定名称的日志器"""
     return logger.bind(name=name)
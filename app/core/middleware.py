@@ -0,0 +1,75 @@
+"""ASGI 中间件"""
+
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("app")
+
+
+class AccessLogMiddleware:
+    """请求日志中间件
+
+    直接基于 ASGI scope 记录请求，不构造 Request 对象；
+    INFO 级别未启用时直接透传
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        url = scope["path"]
+        if scope["query_string"]:
+            url = f"{url}?{scope['query_string'].decode('latin-1')}"
+
+        user_agent = None
+        for name, value in scope["headers"]:
+            if name == b"user-agent":
+                user_agent = value.decode("latin-1")
+                break
+        client = scope.get("client")
+
+        # 记录请求信息
+        logger.info(
+            "Request started: %s %s",
+            method,
+            url,
+            extra={
+                "method": method,
+                "url": url,
+                "user_agent": user_agent,
+                "client_ip": client[0] if client else None,
+            },
+        )
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 记录响应信息
+            process_time = time.perf_counter() - start_time
+            logger.info(
+                "Request completed: %s %s",
+                method,
+                url,
+                extra={
+                    "method": method,
+                    "url": url,
+                    "status_code": status_code,
+                    "process_time": process_time,
+                },
+            )
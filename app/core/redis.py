@@ -1,42 +1,77 @@
-import json
+import asyncio
+import contextlib
 import logging
-import pickle
+from collections.abc import AsyncIterator
 from typing import Any
 
-import redis
+import orjson
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# SCAN 每次迭代的 COUNT 提示，同时也是批量 DELETE 的大小
+SCAN_BATCH_SIZE = 500
+
+# 后台写入：单次管道最多提交的命令数、队列容量
+WRITE_BATCH_SIZE = 256
+WRITE_QUEUE_SIZE = 10_000
+
 
 class RedisCache:
     """Redis 缓存管理器"""
 
     def __init__(self):
-        self.redis_client = redis.Redis.from_url(
-            settings.redis_url,
+        # 共享的阻塞式连接池：连接耗尽时等待而不是报错
+        self._pool = BlockingConnectionPool.from_url(
+            settings.redis.redis_url,
+            max_connections=settings.redis.max_connections,
+            timeout=settings.redis.pool_timeout,
             decode_responses=True,
             socket_connect_timeout=5,
-            socket_timeout=5
+            socket_timeout=5,
         )
+        self.redis_client = Redis(connection_pool=self._pool)
         self.default_timeout = 3600  # 默认 1 小时过期
+        # set_nowait 的待写队列，由后台任务批量写入
+        self._write_queue: asyncio.Queue[tuple[str, bytes, int]] = asyncio.Queue(
+            maxsize=WRITE_QUEUE_SIZE
+        )
+        self._writer_task: asyncio.Task | None = None
+
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        """序列化缓存值（datetime/UUID 等由 orjson 原生处理）"""
+        return orjson.dumps(value, option=orjson.OPT_NAIVE_UTC)
+
+    @staticmethod
+    def _loads(value: Any) -> Any | None:
+        """反序列化缓存值"""
+        if value is None:
+            return None
+
+        # 尝试解析 JSON
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            # 如果不是 JSON，返回原始值
+            return value
+
+    def pipeline(self, transaction: bool = False) -> Pipeline:
+        """创建管道，批量命令在一次往返中发送
+
+        用法：``async with redis_cache.pipeline() as pipe: ...; await pipe.execute()``
+        """
+        return self.redis_client.pipeline(transaction=transaction)
 
     async def get(self, key: str) -> Any | None:
         """获取缓存值"""
         try:
-            value = self.redis_client.get(key)
-            if value is None:
-                return None
-
-            # 尝试解析 JSON
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                # 如果不是 JSON，返回原始值
-                return value
+            return self._loads(await self.redis_client.get(key))
         except Exception as e:
-            logger.error(f"Redis GET error: {e}")
+            logger.error("Redis GET error: %s", e)
             return None
 
     async def set(
@@ -44,109 +79,195 @@ async def set(
         key: str,
         value: Any,
         timeout: int | None = None,
-        use_json: bool = True
+        nx: bool = False,
     ) -> bool:
-        """设置缓存值"""
+        """设置缓存值
+
+        值必须可被 orjson 序列化，否则抛出 TypeError
+
+        Args:
+            nx: 仅在键不存在时写入
+        """
+        serialized_value = self._dumps(value)
+        try:
+            if timeout is None:
+                timeout = self.default_timeout
+            result = await self.redis_client.set(
+                key, serialized_value, ex=timeout, nx=nx
+            )
+            return bool(result)
+        except Exception as e:
+            logger.error("Redis SET error: %s", e)
+            return False
+
+    def set_nowait(self, key: str, value: Any, timeout: int | None = None) -> None:
+        """设置缓存值但不等待 Redis 确认
+
+        命令进入队列，由后台任务通过管道批量写入；适用于只要求最终一致的缓存写
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        try:
+            self._write_queue.put_nowait((key, self._dumps(value), timeout))
+        except asyncio.QueueFull:
+            logger.warning("Redis write queue full, dropping key: %s", key)
+
+    async def _write_batch(self, items: list[tuple[str, bytes, int]]) -> None:
+        try:
+            async with self.pipeline() as pipe:
+                for key, value, timeout in items:
+                    pipe.setex(key, timeout, value)
+                await pipe.execute()
+        except Exception as e:
+            logger.error("Redis background SET error: %s", e)
+
+    def _drain_queue(self, items: list[tuple[str, bytes, int]]) -> None:
+        while len(items) < WRITE_BATCH_SIZE and not self._write_queue.empty():
+            items.append(self._write_queue.get_nowait())
+
+    async def _run_writer(self) -> None:
+        while True:
+            items = [await self._write_queue.get()]
+            self._drain_queue(items)
+            await self._write_batch(items)
+
+    def start_writer(self) -> None:
+        """启动后台写入任务"""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._run_writer())
+
+    async def stop_writer(self) -> None:
+        """停止后台写入任务并写入队列中剩余的命令"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+        while not self._write_queue.empty():
+            items: list[tuple[str, bytes, int]] = []
+            self._drain_queue(items)
+            await self._write_batch(items)
+
+    async def mget(self, keys: list[str]) -> list[Any | None]:
+        """批量获取缓存值，不存在的键对应 None"""
+        if not keys:
+            return []
+        try:
+            values = await self.redis_client.mget(keys)
+            return [self._loads(value) for value in values]
+        except Exception as e:
+            logger.error("Redis MGET error: %s", e)
+            return [None] * len(keys)
+
+    async def mset(self, mapping: dict[str, Any], timeout: int | None = None) -> bool:
+        """批量设置缓存值（带过期时间，一次往返）"""
+        if not mapping:
+            return True
+        serialized = {key: self._dumps(value) for key, value in mapping.items()}
         try:
             if timeout is None:
                 timeout = self.default_timeout
 
-            # 序列化值
-            if use_json:
-                try:
-                    serialized_value = json.dumps(value, ensure_ascii=False)
-                except (TypeError, ValueError):
-                    # 如果不能序列化为 JSON，使用 pickle
-                    serialized_value = pickle.dumps(value)
-                    use_json = False
-            else:
-                serialized_value = value
-
-            # 设置缓存
-            if use_json:
-                result = self.redis_client.setex(key, timeout, serialized_value)
-            else:
-                result = self.redis_client.setex(key, timeout, pickle.dumps(value))
-
-            return result
+            async with self.pipeline() as pipe:
+                for key, value in serialized.items():
+                    pipe.setex(key, timeout, value)
+                results = await pipe.execute()
+            return all(results)
         except Exception as e:
-            logger.error(f"Redis SET error: {e}")
+            logger.error("Redis MSET error: %s", e)
             return False
 
     async def delete(self, key: str) -> bool:
         """删除缓存值"""
         try:
-            result = self.redis_client.delete(key)
+            result = await self.redis_client.delete(key)
             return result > 0
         except Exception as e:
-            logger.error(f"Redis DELETE error: {e}")
+            logger.error("Redis DELETE error: %s", e)
             return False
 
     async def exists(self, key: str) -> bool:
         """检查键是否存在"""
         try:
-            return self.redis_client.exists(key) > 0
+            return await self.redis_client.exists(key) > 0
         except Exception as e:
-            logger.error(f"Redis EXISTS error: {e}")
+            logger.error("Redis EXISTS error: %s", e)
             return False
 
     async def expire(self, key: str, timeout: int) -> bool:
         """设置键的过期时间"""
         try:
-            return self.redis_client.expire(key, timeout)
+            return await self.redis_client.expire(key, timeout)
         except Exception as e:
-            logger.error(f"Redis EXPIRE error: {e}")
+            logger.error("Redis EXPIRE error: %s", e)
             return False
 
     async def ttl(self, key: str) -> int:
         """获取键的剩余生存时间"""
         try:
-            return self.redis_client.ttl(key)
+            return await self.redis_client.ttl(key)
         except Exception as e:
-            logger.error(f"Redis TTL error: {e}")
+            logger.error("Redis TTL error: %s", e)
             return -1
 
     async def clear_pattern(self, pattern: str) -> int:
-        """清除匹配模式的所有键"""
+        """清除匹配模式的所有键
+
+        使用 SCAN 分批遍历（不阻塞 Redis），每批键用一次 DELETE 删除
+        """
+        total = 0
+        batch: list[str] = []
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                return self.redis_client.delete(*keys)
-            return 0
+            async for key in self.redis_client.scan_iter(
+                match=pattern, count=SCAN_BATCH_SIZE
+            ):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    total += await self.redis_client.delete(*batch)
+                    batch.clear()
+            if batch:
+                total += await self.redis_client.delete(*batch)
+            return total
         except Exception as e:
-            logger.error(f"Redis CLEAR_PATTERN error: {e}")
-            return 0
+            logger.error("Redis CLEAR_PATTERN error: %s", e)
+            return total
 
     async def increment(self, key: str, amount: int = 1) -> int | None:
         """递增键的值"""
         try:
-            return self.redis_client.incr(key, amount)
+            return await self.redis_client.incr(key, amount)
         except Exception as e:
-            logger.error(f"Redis INCREMENT error: {e}")
+            logger.error("Redis INCREMENT error: %s", e)
             return None
 
     async def decrement(self, key: str, amount: int = 1) -> int | None:
         """递减键的值"""
         try:
-            return self.redis_client.decr(key, amount)
+            return await self.redis_client.decr(key, amount)
         except Exception as e:
-            logger.error(f"Redis DECREMENT error: {e}")
+            logger.error("Redis DECREMENT error: %s", e)
             return None
 
-    async def get_keys(self, pattern: str = "*") -> list:
-        """获取匹配模式的所有键"""
+    async def get_keys(self, pattern: str = "*") -> AsyncIterator[str]:
+        """遍历匹配模式的所有键（基于 SCAN）
+
+        用法：``async for key in redis_cache.get_keys("user:*"): ...``
+        """
         try:
-            return self.redis_client.keys(pattern)
+            async for key in self.redis_client.scan_iter(
+                match=pattern, count=SCAN_BATCH_SIZE
+            ):
+                yield key
         except Exception as e:
-            logger.error(f"Redis KEYS error: {e}")
-            return []
+            logger.error("Redis SCAN error: %s", e)
 
     async def close(self):
         """关闭 Redis 连接"""
         try:
-            self.redis_client.close()
+            await self.redis_client.aclose()
+            await self._pool.disconnect()
         except Exception as e:
-            logger.error(f"Redis CLOSE error: {e}")
+            logger.error("Redis CLOSE error: %s", e)
 
 
 # 全局 Redis 缓存实例
@@ -157,31 +278,11 @@ class CacheKeyBuilder:
     """缓存键构建器"""
 
     @staticmethod
-    def build_key(prefix: str, *args, **kwargs) -> str:
-        """构建缓存键"""
-        parts = [prefix]
-        parts.extend(str(arg) for arg in args)
-        if kwargs:
-            sorted_kwargs = sorted(kwargs.items())
-            parts.extend(f"{k}={v}" for k, v in sorted_kwargs)
-        return ":".join(parts)
+    def hash_tag(value: Any) -> str:
+        """Redis Cluster 哈希标签，相同标签的键落在同一个槽位"""
+        return f"{{{value}}}"
 
     @staticmethod
-    def user_cache_key(user_id: str | int) -> str:
-        """用户缓存键"""
-        return CacheKeyBuilder.build_key("user", user_id)
-
-    @staticmethod
-    def post_cache_key(post_id: str | int) -> str:
+    def post_cache_key(post_id: Any) -> str:
         """文章缓存键"""
-        return CacheKeyBuilder.build_key("post", post_id)
-
-    @staticmethod
-    def posts_list_cache_key(page: int, size: int, **filters) -> str:
-        """文章列表缓存键"""
-        return CacheKeyBuilder.build_key("posts", "list", page, size, **filters)
-
-    @staticmethod
-    def rate_limit_key(identifier: str, endpoint: str) -> str:
-        """速率限制键"""
-        return CacheKeyBuilder.build_key("rate_limit", identifier, endpoint)
+        return f"post:{CacheKeyBuilder.hash_tag(post_id)}"
@@ -1,5 +1,7 @@
+from datetime import datetime
 from enum import Enum
 from typing import Any
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
@@ -20,6 +22,8 @@ class ErrorCode(str, Enum):
 class ApiResponse(BaseModel):
     """统一 API 响应格式"""
 
+    success: bool = Field(True, description="是否成功")
+    message: str | None = Field(None, description="提示消息")
     data: Any | None = Field(None, description="响应数据")
 
 
@@ -43,10 +47,12 @@ class PaginationMeta(BaseModel):
 
     page: int = Field(..., description="当前页码")
     size: int = Field(..., description="每页大小")
-    total: int = Field(..., description="总记录数")
-    pages: int = Field(..., description="总页数")
+    total: int | None = Field(None, description="总记录数（游标分页时不计算）")
+    pages: int | None = Field(None, description="总页数（游标分页时不计算）")
     has_next: bool = Field(..., description="是否有下一页")
     has_prev: bool = Field(..., description="是否有上一页")
+    next_cursor: datetime | None = Field(None, description="下一页游标")
+    next_cursor_id: UUID | None = Field(None, description="下一页游标 ID")
 
 
 class PaginatedResponse(ApiResponse):
@@ -0,0 +1,94 @@
+"""在已有的异步连接上运行 Alembic 命令
+
+连接通过 ``config.attributes["connection"]`` 传给 alembic/env.py，
+命令复用应用的异步引擎，不再各自创建同步引擎
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# 迁移使用的 PostgreSQL 咨询锁编号，多个进程同时迁移时串行执行
+MIGRATION_LOCK_KEY = 7_305_118_421
+
+
+def get_alembic_config(configure_logger: bool = True) -> Config:
+    """创建 Alembic 配置
+
+    Args:
+        configure_logger: 是否由 env.py 按 alembic.ini 重新配置日志（测试中应关闭）
+    """
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = configure_logger
+    return config
+
+
+def run_with_connection(
+    connection: Connection,
+    config: Config,
+    command: Callable[..., Any],
+    **kwargs: Any,
+) -> Any:
+    """在给定的同步连接上执行 Alembic 命令，供 ``AsyncConnection.run_sync`` 调用"""
+    config.attributes["connection"] = connection
+    try:
+        return command(config, **kwargs)
+    finally:
+        config.attributes.pop("connection", None)
+
+
+async def run_alembic(
+    engine: AsyncEngine,
+    config: Config,
+    command: Callable[..., Any],
+    lock: bool = False,
+    **kwargs: Any,
+) -> Any:
+    """借用引擎的一个连接执行 Alembic 命令
+
+    事务由 Alembic 管理（每个迁移文件一个事务），迁移中可以使用
+    ``op.get_context().autocommit_block()`` 执行 CREATE INDEX CONCURRENTLY 等语句
+
+    Args:
+        lock: 先获取迁移咨询锁（仅 PostgreSQL），避免并发修改 alembic_version
+    """
+    async with engine.connect() as conn:
+        lock = lock and conn.dialect.name == "postgresql"
+        if lock:
+            # 会话级锁，跨越迁移过程中的多个事务
+            await conn.execute(
+                text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+            await conn.commit()
+        try:
+            result = await conn.run_sync(run_with_connection, config, command, **kwargs)
+            await conn.commit()
+            return result
+        finally:
+            if lock:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+                )
+                await conn.commit()
+
+
+async def is_at_head(engine: AsyncEngine, config: Config) -> bool:
+    """数据库是否已处于最新版本
+
+    只读取 alembic_version，不加载迁移环境，用于跳过无事可做的 upgrade
+    """
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    async with engine.connect() as conn:
+        current = await conn.run_sync(
+            lambda sync_conn: MigrationContext.configure(sync_conn).get_current_heads()
+        )
+    return set(current) == heads
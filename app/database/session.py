@@ -1,27 +1,76 @@
 import logging
 from collections.abc import AsyncGenerator
+from uuid import uuid4
 
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+def _connect_args(database_url: str) -> dict:
+    """驱动相关的连接参数"""
+    if not database_url.startswith("postgresql+asyncpg"):
+        return {}
+
+    if settings.database.pgbouncer:
+        return {
+            # 事务模式下同一会话的语句可能落在不同的服务端连接上，
+            # 预编译语句无法复用，必须关闭缓存并使用唯一的语句名
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            # PgBouncer 会拒绝未知的启动参数，这里只传它支持的 application_name
+            "server_settings": {"application_name": settings.app_name},
+        }
+
+    return {
+        # SQLAlchemy 层的预编译语句缓存
+        "prepared_statement_cache_size": settings.database.statement_cache_size,
+        # asyncpg 自身的语句缓存
+        "statement_cache_size": settings.database.statement_cache_size,
+        "server_settings": {
+            "application_name": settings.app_name,
+            # 短小的 OLTP 查询用不上 JIT，编译开销反而拖慢执行
+            "jit": "off",
+        },
+    }
+
+
+def _pool_args() -> dict:
+    """连接池参数"""
+    if settings.database.pgbouncer:
+        # 连接复用交给 PgBouncer，应用侧不再保留连接
+        return {"poolclass": NullPool}
+
+    return {
+        "pool_size": settings.database.pool_size,
+        "max_overflow": settings.database.max_overflow,
+        "pool_pre_ping": settings.database.pool_pre_ping,
+        "pool_recycle": settings.database.pool_recycle,
+        # 优先复用最近归还的连接，使热点连接保持活跃
+        "pool_use_lifo": True,
+    }
+
+
 # 创建异步数据库引擎
 engine = create_async_engine(
     settings.database.database_url,
-    echo=settings.debug,
+    # 只在开发环境的调试模式下输出 SQL，避免误开 DEBUG 时拖慢生产
+    echo=settings.debug and settings.is_development,
     future=True,
-    pool_size=20,
-    max_overflow=30,
-    pool_pre_ping=True,
-    pool_recycle=3600,
+    # 编译后 SQL 的 LRU 缓存容量，热点语句只在首次执行时编译
+    query_cache_size=settings.database.query_cache_size,
+    connect_args=_connect_args(settings.database.database_url),
+    **_pool_args(),
 )
 
 # 创建异步会话工厂
-AsyncSessionLocal = sessionmaker(
+AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
@@ -40,10 +89,13 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.commit()
         except SQLAlchemyError as e:
             await session.rollback()
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
             raise
-        finally:
-            await session.close()
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """获取会话工厂，供需要自行管理会话生命周期的场景（如流式响应）使用"""
+    return AsyncSessionLocal
 
 
 async def create_tables():
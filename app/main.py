@@ -1,17 +1,36 @@
-import logging
-import time
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import configure_mappers
 
 from app.api.v1 import api_router
+from app.auth.service import last_login_recorder
 from app.core.config import settings
 from app.core.exceptions import register_exception_handlers
-from app.core.logging import setup_logging
+from app.core.logging import flush_logging, setup_logging
+from app.core.middleware import AccessLogMiddleware
+from app.core.redis import redis_cache
 
 # 设置日志
 setup_logging()
-logger = logging.getLogger("app")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """应用生命周期"""
+    # 启动时一次性完成 ORM 映射配置，避免首个请求承担这部分开销
+    configure_mappers()
+    last_login_recorder.start()
+    redis_cache.start_writer()
+    yield
+    await redis_cache.stop_writer()
+    await redis_cache.close()
+    await last_login_recorder.stop()
+    await flush_logging()
+
 
 # 创建 FastAPI 应用
 app = FastAPI(
@@ -22,6 +41,8 @@
     docs_url="/api/v1/docs",
     redoc_url="/api/v1/redoc",
     debug=settings.debug,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # 添加 CORS 中间件
@@ -33,6 +54,9 @@
     allow_headers=settings.cors.allowed_headers,
 )
 
+# 添加请求日志中间件（最后添加，位于最外层）
+app.add_middleware(AccessLogMiddleware)
+
 # 注册全局异常处理器
 register_exception_handlers(app)
 
@@ -40,60 +64,36 @@
 app.include_router(api_router, prefix="/api/v1")
 
 
-# 请求日志中间件
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-
-    # 记录请求信息
-    logger.info(
-        f"Request started: {request.method} {request.url}",
-        extra={
-            "method": request.method,
-            "url": str(request.url),
-            "user_agent": request.headers.get("user-agent"),
-            "client_ip": request.client.host,
-        },
-    )
-
-    response = await call_next(request)
-
-    # 记录响应信息
-    process_time = time.time() - start_time
-    logger.info(
-        f"Request completed: {request.method} {request.url}",
-        extra={
-            "method": request.method,
-            "url": str(request.url),
-            "status_code": response.status_code,
-            "process_time": process_time,
-        },
-    )
-
-    return response
+# 健康检查与根路径的响应内容固定，启动时序列化一次
+_HEALTH_BODY = orjson.dumps(
+    {
+        "status": "healthy",
+        "service": settings.app_name,
+        "version": settings.app_version,
+    }
+)
+_ROOT_BODY = orjson.dumps(
+    {
+        "message": f"Welcome to {settings.app_name}",
+        "version": settings.app_version,
+        "docs_url": "/api/v1/docs",
+        "redoc_url": "/api/v1/redoc",
+    }
+)
 
 
 # 健康检查端点
 @app.get("/health", summary="健康检查")
 async def health_check():
     """健康检查端点"""
-    return {
-        "status": "healthy",
-        "service": settings.app_name,
-        "version": settings.app_version,
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # 根路径
 @app.get("/", summary="API 信息")
 async def root():
     """根路径，返回 API 基本信息"""
-    return {
-        "message": f"Welcome to {settings.app_name}",
-        "version": settings.app_version,
-        "docs_url": "/api/v1/docs",
-        "redoc_url": "/api/v1/redoc",
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -1,32 +0,0 @@
-import uuid
-
-from sqlalchemy import Column, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-
-from app.database.session import Base
-from app.models.mixins import ActiveMixin, SoftDeleteModel, AuditableModel
-
-
-class BaseModel(ActiveMixin, SoftDeleteModel, AuditableModel, Base):
-    """基础模型类 - 包含所有通用功能"""
-
-    __abstract__ = True
-
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-
-
-class AuditLog(BaseModel):
-    """审计日志模型"""
-
-    __tablename__ = "audit_logs"
-
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    action = Column(String(50), nullable=False, index=True)
-    resource_type = Column(String(50), nullable=False, index=True)
-    resource_id = Column(String(50), nullable=False)
-    details = Column(JSONB, nullable=True)
-    ip_address = Column(String(45), nullable=True)
-    user_agent = Column(Text, nullable=True)
-
-    def __repr__(self):
-        return f"<AuditLog(id={self.id}, action={self.action}, resource_type={self.resource_type})>"
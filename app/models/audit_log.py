@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, String, Text
+from sqlalchemy import JSON, Column, ForeignKey, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from app.models.base import BaseModel
@@ -13,7 +13,8 @@ class AuditLog(BaseModel):
     action = Column(String(50), nullable=False, index=True)
     resource_type = Column(String(50), nullable=False, index=True)
     resource_id = Column(String(50), nullable=False)
-    details = Column(JSONB, nullable=True)
+    # PostgreSQL 上为 JSONB，其他数据库（如测试用的 SQLite）退化为 JSON
+    details = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
     ip_address = Column(String(45), nullable=True)
     user_agent = Column(Text, nullable=True)
 
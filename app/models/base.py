@@ -1,8 +1,9 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, Column, DateTime, func
+from sqlalchemy import Boolean, Column, DateTime, event, func
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session, with_loader_criteria
 from sqlalchemy.sql import expression
 
 from app.database.session import Base
@@ -17,26 +18,29 @@ class BaseModel(Base):
 
 
 class SoftDeletableModel:
-    """软删除模型基类"""
+    """软删除模型基类
+
+    查询默认只返回未删除的记录（见 _filter_soft_deleted），
+    子类应在 ``is_deleted = false`` 上建部分索引而不是给这两列建普通索引
+    """
 
     __abstract__ = True
 
-    deleted_at = Column(
-        DateTime(timezone=True), nullable=True, index=True, comment="删除时间"
-    )
+    deleted_at = Column(DateTime(timezone=True), nullable=True, comment="删除时间")
     is_deleted = Column(
         Boolean,
         default=False,
         nullable=False,
-        index=True,
         server_default=expression.false(),
         comment="是否已删除",
     )
 
     def delete(self):
         """软删除实例"""
-        self.updated_at = datetime.now(UTC)
-        self.deleted_at = datetime.now(UTC)
+        # 同一时刻取一次，保证两个时间戳一致
+        now = datetime.now(UTC)
+        self.updated_at = now
+        self.deleted_at = now
         self.is_deleted = True
 
     def restore(self):
@@ -51,6 +55,27 @@ def is_active_deleted(self):
         return self.is_deleted or self.deleted_at is not None
 
 
+@event.listens_for(Session, "do_orm_execute")
+def _filter_soft_deleted(execute_state):
+    """为所有 ORM 查询追加 is_deleted = false 条件
+
+    需要包含已删除记录时使用 ``execution_options(include_deleted=True)``
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                SoftDeletableModel,
+                lambda cls: cls.is_deleted == expression.false(),
+                include_aliases=True,
+            )
+        )
+
+
 class AuditableModel:
     """时间戳模型基类"""
 
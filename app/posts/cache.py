@@ -0,0 +1,48 @@
+"""Posts 模块的缓存
+
+只缓存已发布的文章（对所有用户可见，与访问者无关），文章或作者信息变更后失效
+
+失效时不直接删除键，而是写入短期的失效标记；读请求只用 SET NX 回填缓存，
+失效前已从数据库读到旧数据的请求不会在失效之后把旧数据写回去
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+from app.core.redis import CacheKeyBuilder, redis_cache
+from app.posts.constants import PostConstants
+from app.posts.schemas import PostResponse
+
+# 失效标记，读取时不是 dict，按未命中处理
+_INVALIDATED = "invalidated"
+
+
+async def get_cached_post(post_id: Any) -> PostResponse | None:
+    """读取缓存的文章响应，未命中、已失效或 Redis 不可用时返回 None"""
+    data = await redis_cache.get(CacheKeyBuilder.post_cache_key(post_id))
+    if not isinstance(data, dict):
+        return None
+    return PostResponse.model_validate(data)
+
+
+async def cache_post(post: PostResponse) -> bool:
+    """回填文章缓存，键已存在（含失效标记）时不覆盖"""
+    return await redis_cache.set(
+        CacheKeyBuilder.post_cache_key(post.id),
+        post.model_dump(),
+        PostConstants.POST_CACHE_TIMEOUT,
+        nx=True,
+    )
+
+
+async def invalidate_posts(post_ids: Iterable[Any]) -> None:
+    """使文章缓存失效（一次往返写入所有失效标记）"""
+    await redis_cache.mset(
+        {CacheKeyBuilder.post_cache_key(post_id): _INVALIDATED for post_id in post_ids},
+        PostConstants.POST_INVALIDATION_TIMEOUT,
+    )
+
+
+async def invalidate_post(post_id: Any) -> None:
+    """使单篇文章缓存失效"""
+    await invalidate_posts([post_id])
@@ -42,4 +42,14 @@ class PostConstants:
 
     # 排序相关
     DEFAULT_SORT_BY = "created_at"
-    ALLOWED_SORT_FIELDS = ["created_at", "updated_at", "published_at", "title", "views"]
+    ALLOWED_SORT_FIELDS: frozenset[str] = frozenset(
+        {"created_at", "updated_at", "published_at", "title"}
+    )
+
+    # 缓存相关（秒）
+    POST_CACHE_TIMEOUT = 300
+    # 文章失效标记的存活时间，覆盖失效前已开始的读请求写回缓存的窗口
+    POST_INVALIDATION_TIMEOUT = 10
+
+    # 导出相关：服务端游标每批读取的行数
+    EXPORT_BATCH_SIZE = 500
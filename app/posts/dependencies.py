@@ -1,24 +1,27 @@
 """Posts 模块的依赖项"""
 
+from uuid import UUID
+
 from fastapi import Depends
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_active_user
 from app.auth.models import User
 from app.database.session import get_db
+from app.posts.cache import cache_post, get_cached_post
+from app.posts.exceptions import AccessDeniedError, NotAuthorError, PostNotFoundError
 from app.posts.models import Post
+from app.posts.schemas import PostResponse
+from app.posts.service import PostService
 
 
 async def get_post_by_id(
-    post_id,
+    post_id: UUID,
     db: AsyncSession = Depends(get_db)
 ) -> Post:
     """根据 ID 获取文章"""
-    from sqlalchemy import select
-
-    from app.posts.exceptions import PostNotFoundError
-    result = await db.execute(select(Post).where(Post.id == post_id))
-    post = result.scalar_one_or_none()
+    post = await PostService.get_post_by_id(db, post_id)
 
     if not post:
         raise PostNotFoundError("Post not found")
@@ -31,9 +34,6 @@ async def get_post_by_slug(
     db: AsyncSession = Depends(get_db)
 ) -> Post:
     """根据 slug 获取文章"""
-    from sqlalchemy import select
-
-    from app.posts.exceptions import PostNotFoundError
     result = await db.execute(select(Post).where(Post.slug == slug))
     post = result.scalar_one_or_none()
 
@@ -48,8 +48,6 @@ async def check_post_ownership(
     current_user: User = Depends(get_current_active_user)
 ) -> Post:
     """检查文章所有权"""
-    from app.posts.exceptions import NotAuthorError
-
     if post.author_id != current_user.id and not current_user.is_superuser:
         raise NotAuthorError("You are not the author of this post")
 
@@ -61,8 +59,6 @@ async def check_post_access(
     current_user: User = Depends(get_current_active_user)
 ) -> Post:
     """检查文章访问权限"""
-    from app.posts.exceptions import AccessDeniedError
-
     # 如果文章已发布，任何人都可以访问
     if post.is_published:
         return post
@@ -74,15 +70,42 @@ async def check_post_access(
     raise AccessDeniedError("Access denied")
 
 
+async def get_readable_post(
+    post_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> PostResponse:
+    """获取当前用户可读的文章详情，已发布文章优先读缓存"""
+    cached = await get_cached_post(post_id)
+    if cached is not None:
+        return cached
+
+    post = await get_post_by_id(post_id, db)
+    if not await PostService.check_post_access(post, current_user):
+        raise AccessDeniedError("Access denied")
+
+    response = PostResponse.model_validate(post)
+    if post.is_published:
+        await cache_post(response)
+    return response
+
+
 class PostPermissionChecker:
     """文章权限检查器"""
 
     def __init__(self, require_author: bool = False):
         self.require_author = require_author
 
-    def __call__(self, post: Post = Depends(get_post_by_id), current_user: User = Depends(get_current_active_user)):
-        from app.posts.exceptions import AccessDeniedError, NotAuthorError
+    # FastAPI 按依赖对象缓存解析结果，配置相同的检查器视为同一依赖
+    def __hash__(self) -> int:
+        return hash((type(self), self.require_author))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PostPermissionChecker):
+            return NotImplemented
+        return self.require_author == other.require_author
 
+    async def __call__(self, post: Post = Depends(get_post_by_id), current_user: User = Depends(get_current_active_user)):
         # 检查访问权限
         if not post.is_published and post.author_id != current_user.id and not current_user.is_superuser:
             raise AccessDeniedError("Access denied")
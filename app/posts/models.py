@@ -1,4 +1,15 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    event,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -23,10 +34,37 @@ class Post(SoftDeletableModel, AuditableModel, BaseModel):
     # 关系
     author = relationship("User", back_populates="posts")
 
+    # 列表查询只涉及未删除的文章，按创建时间排序的部分索引只覆盖这些行
+    __table_args__ = (
+        Index(
+            "ix_posts_live",
+            "created_at",
+            postgresql_where=text("is_deleted = false"),
+        ),
+        # 搜索使用 ILIKE '%词%'，btree 索引无法命中前导通配符，改用 pg_trgm 的 GIN 索引
+        *(
+            Index(
+                f"ix_posts_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for column in ("title", "content", "summary")
+        ),
+    )
+
     def __repr__(self):
         return f"<Post(id={self.id}, title={self.title}, slug={self.slug})>"
 
 
+# 直接 create_all 建表时先确保 trigram 扩展存在（迁移中同样会创建）
+event.listen(
+    Post.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class Tag(BaseModel):
     """标签模型"""
 
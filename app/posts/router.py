@@ -3,14 +3,20 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.auth.dependencies import get_current_active_user
-from app.auth.models import User
+from app.auth.dependencies import CurrentUser
 from app.core.decorators import handle_response
-from app.database.session import get_db
-from app.posts.exceptions import AccessDeniedError, PostNotFoundError
-from app.posts.schemas import PostCreate, PostResponse, PostUpdate
+from app.database.session import get_db, get_session_factory
+from app.posts.dependencies import get_readable_post, require_post_author
+from app.posts.models import Post
+from app.posts.schemas import (
+    PostCreate,
+    PostListItemList,
+    PostResponse,
+    PostUpdate,
+)
 from app.posts.service import PostService
 from app.utils.pagination import QueryParams
 
@@ -20,8 +26,8 @@
 @router.post("/", response_model=dict, summary="创建文章")
 @handle_response("文章创建成功")
 async def create_post(
+    current_user: CurrentUser,
     post_data: PostCreate,
-    current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """创建文章"""
@@ -32,11 +38,11 @@ async def create_post(
 @router.get("/", response_model=dict, summary="获取文章列表1")
 @handle_response()
 async def get_posts(
+    current_user: CurrentUser,
     params: QueryParams = Depends(),
     search: str | None = Query(None, description="搜索标题或内容"),
     is_published: bool | None = Query(None, description="是否发布"),
     author_id: UUID | None = Query(None, description="作者 ID"),
-    current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """获取文章列表"""
@@ -49,75 +55,58 @@ async def get_posts(
         author_id=author_id,
         sort_by=params.sort_by or "created_at",
         sort_order=params.sort_order,
+        cursor=params.cursor,
+        cursor_id=params.cursor_id,
+        viewer=current_user,
     )
 
-    # 如果不是超级用户，过滤掉未发布的非自己文章
-    if not current_user.is_superuser:
-        filtered_items = []
-        for post in result["items"]:
-            if await PostService.check_post_access(post, current_user):
-                filtered_items.append(post)
-
-        result["items"] = filtered_items
-        result["meta"]["total"] = len(filtered_items)
-
     return {
-        "items": [PostResponse.model_validate(post) for post in result["items"]],
+        "items": PostListItemList.validate_python(
+            result["items"], from_attributes=True
+        ),
         "meta": result["meta"],
     }
 
 
 @router.get("/{post_id}", response_model=dict, summary="获取文章详情")
 @handle_response()
-async def get_post(
-    post_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
-):
+async def get_post(post: PostResponse = Depends(get_readable_post)):
     """获取文章详情"""
-    post = await PostService.get_post_by_id(db, post_id)
-    if not post:
-        raise PostNotFoundError("Post not found")
-
-    # 检查访问权限
-    if not await PostService.check_post_access(post, current_user):
-        raise AccessDeniedError("Access denied")
-
-    return PostResponse.model_validate(post)
+    return post
 
 
 @router.put("/{post_id}", response_model=dict, summary="更新文章")
 @handle_response("文章更新成功")
 async def update_post(
-    post_id: UUID,
+    current_user: CurrentUser,
     post_data: PostUpdate,
-    current_user: User = Depends(get_current_active_user),
+    post: Post = Depends(require_post_author),
     db: AsyncSession = Depends(get_db),
 ):
     """更新文章"""
-    post = await PostService.update_post(db, post_id, post_data, current_user)
+    post = await PostService.update_post(db, post, post_data, current_user)
     return PostResponse.model_validate(post)
 
 
 @router.delete("/{post_id}", response_model=dict, summary="删除文章")
 @handle_response("文章删除成功")
 async def delete_post(
-    post_id: UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser,
+    post: Post = Depends(require_post_author),
     db: AsyncSession = Depends(get_db),
 ):
     """删除文章"""
-    await PostService.delete_post(db, post_id, current_user)
+    await PostService.delete_post(db, post, current_user)
     return {"message": "Post deleted successfully"}
 
 
 @router.get("/my/posts", response_model=dict, summary="获取我的文章")
 @handle_response()
 async def get_my_posts(
+    current_user: CurrentUser,
     params: QueryParams = Depends(),
     search: str | None = Query(None, description="搜索标题或内容"),
     is_published: bool | None = Query(None, description="是否发布"),
-    current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """获取我的文章"""
@@ -130,9 +119,29 @@ async def get_my_posts(
         is_published=is_published,
         sort_by=params.sort_by or "created_at",
         sort_order=params.sort_order,
+        cursor=params.cursor,
+        cursor_id=params.cursor_id,
     )
 
     return {
-        "items": [PostResponse.model_validate(post) for post in result["items"]],
+        "items": PostListItemList.validate_python(
+            result["items"], from_attributes=True
+        ),
         "meta": result["meta"],
     }
+
+
+@router.get("/my/posts/export", summary="导出我的文章")
+async def export_my_posts(
+    current_user: CurrentUser,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """以 NDJSON 流式导出我的全部文章，每行一篇"""
+
+    async def lines():
+        # 依赖项在响应体发送前就已清理，流式读取使用独立会话
+        async with session_factory() as db:
+            async for post in PostService.iter_user_posts(db, current_user.id):
+                yield PostResponse.model_validate(post).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
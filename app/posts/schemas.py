@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from app.auth.schemas import UserResponse
 
@@ -34,7 +34,7 @@ class PostResponse(PostBase):
     slug: str
     author_id: UUID
     created_at: datetime
-    updated_at: datetime
+    updated_at: datetime | None = None
     published_at: datetime | None = None
     author: UserResponse | None = None
 
@@ -42,6 +42,27 @@ class Config:
         from_attributes = True
 
 
+class PostListItem(BaseModel):
+    """文章列表项模型（不含正文）"""
+    id: UUID
+    title: str
+    slug: str
+    summary: str | None = None
+    is_published: bool
+    published_at: datetime | None = None
+    created_at: datetime
+    author_id: UUID
+    author: UserResponse | None = None
+
+    class Config:
+        from_attributes = True
+
+
+# 列表响应适配器，模块级构建一次供各请求复用
+PostResponseList = TypeAdapter(list[PostResponse])
+PostListItemList = TypeAdapter(list[PostListItem])
+
+
 class TagBase(BaseModel):
     """标签基础模型"""
     name: str = Field(..., min_length=1, max_length=50, description="标签名称")
@@ -65,7 +86,7 @@ class TagResponse(TagBase):
     """标签响应模型"""
     id: UUID
     created_at: datetime
-    updated_at: datetime
+    updated_at: datetime | None = None
 
     class Config:
         from_attributes = True
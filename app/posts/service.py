@@ -1,18 +1,21 @@
 """Posts 模块的服务层"""
 
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.auth.models import User
 from app.core.logging import get_logger
-from app.posts.exceptions import (
-    NotAuthorError,
-    PostNotFoundError,
-    SlugAlreadyExistsError,
-)
+from app.posts.cache import invalidate_post, invalidate_posts
+from app.posts.constants import PostConstants
+from app.posts.exceptions import SlugAlreadyExistsError
 from app.posts.models import Post
 from app.posts.schemas import PostCreate, PostUpdate
 
@@ -27,41 +30,39 @@ async def create_post(
         db: AsyncSession, post_data: PostCreate, author: User
     ) -> Post:
         """创建文章"""
-        # 检查 slug 是否已存在
-        result = await db.execute(select(Post).where(Post.slug == post_data.slug))
-        if result.scalar_one_or_none():
-            raise SlugAlreadyExistsError("Slug already exists")
-
-        # 创建文章
-        db_post = Post(
-            title=post_data.title,
-            content=post_data.content,
-            slug=post_data.slug,
-            summary=post_data.summary,
-            is_published=post_data.is_published,
-            author_id=author.id,
+        # slug 冲突由唯一索引在同一条 INSERT 中判定，并发创建时也不会误判
+        stmt = (
+            pg_insert(Post)
+            .values(
+                **post_data.model_dump(),
+                author_id=author.id,
+                published_at=datetime.now(UTC) if post_data.is_published else None,
+            )
+            .on_conflict_do_nothing(index_elements=[Post.slug])
+            .returning(Post)
         )
+        db_post = await db.scalar(stmt)
+        if db_post is None:
+            raise SlugAlreadyExistsError("Slug already exists")
 
-        if post_data.is_published:
-            db_post.published_at = datetime.now(timezone.UTC)
-
-        db.add(db_post)
+        # RETURNING 已带回全部列，作者直接使用当前用户，无需 refresh 或懒加载
+        set_committed_value(db_post, "author", author)
         await db.commit()
-        await db.refresh(db_post)
 
-        logger.info(f"New post created: {post_data.title} by {author.username}")
+        logger.info("New post created: {} by {}", post_data.title, author.username)
         return db_post
 
     @staticmethod
     async def get_post_by_id(db: AsyncSession, post_id: UUID) -> Post | None:
         """根据 ID 获取文章"""
-        result = await db.execute(select(Post).where(Post.id == post_id))
-        return result.scalar_one_or_none()
+        return await db.get(Post, post_id, options=[selectinload(Post.author)])
 
     @staticmethod
     async def get_post_by_slug(db: AsyncSession, slug: str) -> Post | None:
         """根据 slug 获取文章"""
-        result = await db.execute(select(Post).where(Post.slug == slug))
+        result = await db.execute(
+            select(Post).options(selectinload(Post.author)).where(Post.slug == slug)
+        )
         return result.scalar_one_or_none()
 
     @staticmethod
@@ -74,8 +75,16 @@ async def get_posts(
         author_id: UUID | None = None,
         sort_by: str = "created_at",
         sort_order: str = "desc",
+        viewer: User | None = None,
+        cursor: datetime | None = None,
+        cursor_id: UUID | None = None,
     ) -> dict:
-        """获取文章列表"""
+        """获取文章列表
+
+        Args:
+            viewer: 当前用户，非超级用户只能看到已发布或自己的文章
+            cursor: 游标分页起点（上一页的 next_cursor），仅支持按创建时间排序
+        """
         from app.utils.pagination import get_paginated_results
 
         filters = {}
@@ -84,6 +93,13 @@ async def get_posts(
         if author_id:
             filters["author_id"] = author_id
 
+        # 访问权限过滤下推到 SQL，保证分页和总数准确
+        conditions = []
+        if viewer is not None and not viewer.is_superuser:
+            conditions.append(
+                or_(Post.is_published.is_(True), Post.author_id == viewer.id)
+            )
+
         result = await get_paginated_results(
             session=db,
             model=Post,
@@ -94,66 +110,98 @@ async def get_posts(
             search_term=search,
             search_fields=["title", "content", "summary"],
             filters=filters,
+            conditions=conditions,
+            options=[
+                # 列表不返回正文，只加载列表项需要的列
+                load_only(
+                    Post.id,
+                    Post.title,
+                    Post.slug,
+                    Post.summary,
+                    Post.is_published,
+                    Post.published_at,
+                    Post.created_at,
+                    Post.author_id,
+                ),
+                # 响应中包含作者信息，一次 IN 查询批量加载，避免逐行懒加载
+                selectinload(Post.author),
+            ],
+            cursor=cursor,
+            cursor_id=cursor_id,
+            allowed_sort_fields=PostConstants.ALLOWED_SORT_FIELDS,
         )
 
         return result
 
     @staticmethod
     async def update_post(
-        db: AsyncSession, post_id: UUID, post_data: PostUpdate, current_user: User
+        db: AsyncSession, post: Post, post_data: PostUpdate, current_user: User
     ) -> Post:
-        """更新文章"""
-        post = await PostService.get_post_by_id(db, post_id)
-        if not post:
-            raise PostNotFoundError("Post not found")
-
-        # 检查权限
-        if post.author_id != current_user.id and not current_user.is_superuser:
-            raise NotAuthorError("You are not the author of this post")
-
-        # 检查 slug 是否已被其他文章使用
-        if post_data.slug and post_data.slug != post.slug:
-            slug_result = await db.execute(
-                select(Post).where(Post.slug == post_data.slug, Post.id != post_id)
-            )
-            if slug_result.scalar_one_or_none():
-                raise SlugAlreadyExistsError("Slug already exists")
+        """更新文章
+
+        Args:
+            post: 已由 require_post_author 依赖加载并完成权限校验的文章
+        """
+        # 只保留与当前值不同的字段，没有变化时不发起 UPDATE
+        update_data = {
+            field: value
+            for field, value in post_data.model_dump(exclude_unset=True).items()
+            if getattr(post, field) != value
+        }
+        if not update_data:
+            return post
+
+        slug_changed = "slug" in update_data
 
         # 更新文章
-        update_data = post_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(post, field, value)
 
         # 如果发布状态改变，更新发布时间
         if "is_published" in update_data:
             if post.is_published and not post.published_at:
-                post.published_at = datetime.now(timezone.UTC)
+                post.published_at = datetime.now(UTC)
             elif not post.is_published:
                 post.published_at = None
 
-        await db.commit()
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            # slug 唯一索引冲突，省去提交前的存在性查询且不受并发影响
+            if slug_changed:
+                raise SlugAlreadyExistsError("Slug already exists") from e
+            raise
         await db.refresh(post)
+        await invalidate_post(post.id)
 
-        logger.info(f"Post updated: {post.title} by {current_user.username}")
+        logger.info("Post updated: {} by {}", post.title, current_user.username)
         return post
 
     @staticmethod
-    async def delete_post(db: AsyncSession, post_id: UUID, current_user: User) -> bool:
-        """删除文章"""
-        post = await PostService.get_post_by_id(db, post_id)
-        if not post:
-            raise PostNotFoundError("Post not found")
-
-        # 检查权限
-        if post.author_id != current_user.id and not current_user.is_superuser:
-            raise NotAuthorError("You are not the author of this post")
+    async def delete_post(db: AsyncSession, post: Post, current_user: User) -> bool:
+        """删除文章（软删除，查询默认过滤已删除的文章）
 
-        await db.delete(post)
+        Args:
+            post: 已由 require_post_author 依赖加载并完成权限校验的文章
+        """
+        post.delete()
         await db.commit()
+        await invalidate_post(post.id)
 
-        logger.info(f"Post deleted: {post.title} by {current_user.username}")
+        logger.info("Post deleted: {} by {}", post.title, current_user.username)
         return True
 
+    @staticmethod
+    async def invalidate_author_posts(db: AsyncSession, author_id: UUID) -> None:
+        """作者信息变更后，使其已发布文章的缓存失效（缓存中包含作者信息）"""
+        result = await db.execute(
+            select(Post.id).where(
+                Post.author_id == author_id, Post.is_published.is_(True)
+            )
+        )
+        await invalidate_posts(result.scalars())
+
     @staticmethod
     async def check_post_access(post: Post, current_user: User) -> bool:
         """检查文章访问权限"""
@@ -177,6 +225,8 @@ async def get_user_posts(
         is_published: bool | None = None,
         sort_by: str = "created_at",
         sort_order: str = "desc",
+        cursor: datetime | None = None,
+        cursor_id: UUID | None = None,
     ) -> dict:
         """获取用户的文章列表"""
         return await PostService.get_posts(
@@ -188,4 +238,25 @@ async def get_user_posts(
             author_id=user_id,
             sort_by=sort_by,
             sort_order=sort_order,
+            cursor=cursor,
+            cursor_id=cursor_id,
+        )
+
+    @staticmethod
+    async def iter_user_posts(
+        db: AsyncSession, user_id: UUID
+    ) -> AsyncIterator[Post]:
+        """按创建时间逐行读取用户的全部文章
+
+        使用服务端游标分批读取，内存占用与文章总数无关
+        """
+        result = await db.stream_scalars(
+            select(Post)
+            # 导出的都是同一作者的文章，不加载作者信息
+            .options(noload(Post.author))
+            .where(Post.author_id == user_id)
+            .order_by(Post.created_at, Post.id)
+            .execution_options(yield_per=PostConstants.EXPORT_BATCH_SIZE)
         )
+        async for post in result:
+            yield post
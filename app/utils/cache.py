@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class TTLCache:
+    """进程内有界 LRU 缓存，条目按各自的过期时间惰性淘汰（线程安全）"""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """获取缓存值，不存在或已过期时返回 None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        """设置缓存值
+
+        Args:
+            expires_at: 过期时间戳（秒），为空时使用 ttl 计算
+        """
+        if self.maxsize <= 0:
+            # 容量为 0 表示禁用缓存
+            return
+
+        if expires_at is None:
+            if self.ttl is None:
+                raise ValueError("expires_at is required when ttl is not set")
+            expires_at = time.time() + self.ttl
+
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif len(self._data) >= self.maxsize:
+                # 淘汰最久未使用的条目
+                self._data.popitem(last=False)
+            self._data[key] = (value, expires_at)
+
+    def pop(self, key: Hashable) -> Any | None:
+        """移除并返回缓存值"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry else None
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,17 +1,34 @@
+import asyncio
+from datetime import datetime
+from functools import cache
 from math import ceil
 from typing import Any, Generic, TypeVar
+from uuid import UUID
 
 from fastapi import HTTPException, Query, status
 from pydantic import BaseModel
-from sqlalchemy import and_, func, or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql.base import ExecutableOption
 
+from app.core.config import settings
 from app.core.schemas import PaginationMeta
+from app.database.session import AsyncSessionLocal
 
 T = TypeVar('T', bound=DeclarativeBase)
 
 
+@cache
+def _column_map(model: type) -> dict[str, Any]:
+    """模型的 {字段名: 列属性} 映射，每个模型只计算一次"""
+    return {
+        attr.key: getattr(model, attr.key)
+        for attr in sa_inspect(model).mapper.column_attrs
+    }
+
+
 class Paginator(Generic[T]):
     """分页器"""
 
@@ -23,15 +40,40 @@ def __init__(
         size: int = 10,
         filters: dict[str, Any] | None = None,
         sort_by: str | None = None,
-        sort_order: str = "asc"
+        sort_order: str = "asc",
+        conditions: list[Any] | None = None,
+        options: list[ExecutableOption] | None = None,
+        cursor: datetime | None = None,
+        cursor_id: UUID | None = None,
+        allowed_sort_fields: frozenset[str] | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None
     ):
         self.session = session
+        # 并发计数使用的会话工厂，必须从引擎获取新连接，不能复用当前会话的连接
+        self.session_factory = session_factory or AsyncSessionLocal
         self.model = model
         self.page = page
         self.size = size
         self.filters = filters or {}
+        self.conditions = conditions or []
+        self.options = options or []
         self.sort_by = sort_by
         self.sort_order = sort_order.lower()
+        self.columns = _column_map(model)
+        # 排序字段在构造时解析，无效字段回退为默认排序（按创建时间倒序）
+        self.sort_column = self.columns.get(sort_by) if sort_by else None
+        if self.sort_column is not None:
+            self.order_column = self.sort_column
+            self.descending = self.sort_order == "desc"
+        else:
+            self.order_column = self.columns.get("created_at")
+            self.descending = True
+        # 游标分页：从 (created_at, id) 位于游标之后的记录开始读取，不计数也不跳过行
+        self.cursor = cursor
+        self.cursor_id = cursor_id
+        # WHERE 条件只构建一次，计数和分页查询共用同一个表达式
+        conditions = self.build_conditions()
+        self.where = and_(*conditions) if conditions else None
 
         # 验证分页参数
         if page < 1:
@@ -46,73 +88,151 @@ def __init__(
                 detail="Size must be between 1 and 100"
             )
 
-    async def get_total_count(self) -> int:
-        """获取总记录数"""
-        query = select(func.count(self.model.id))
+        # 给定白名单时拒绝其他排序字段，而不是静默回退为默认排序
+        if (
+            allowed_sort_fields is not None
+            and sort_by
+            and (sort_by not in allowed_sort_fields or self.sort_column is None)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Invalid sort field: {sort_by}"
+            )
 
-        # 应用过滤器
-        if self.filters:
-            conditions = []
-            for field, value in self.filters.items():
-                if hasattr(self.model, field):
-                    column = getattr(self.model, field)
-                    if isinstance(value, str) and '%' in value:
-                        conditions.append(column.ilike(value))
-                    else:
-                        conditions.append(column == value)
+        if cursor is not None and (
+            self.order_column is None or self.order_column.key != "created_at"
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Cursor pagination requires sorting by created_at"
+            )
 
-            if conditions:
-                query = query.where(and_(*conditions))
+    def build_conditions(self) -> list[Any]:
+        """构建过滤条件"""
+        conditions = list(self.conditions)
+        for field, value in self.filters.items():
+            column = self.columns.get(field)
+            if column is not None:
+                if isinstance(value, str) and '%' in value:
+                    conditions.append(column.ilike(value))
+                else:
+                    conditions.append(column == value)
+        return conditions
 
-        result = await self.session.execute(query)
+    def _count_query(self):
+        query = select(func.count(self.model.id))
+        if self.where is not None:
+            query = query.where(self.where)
+        return query
+
+    async def get_total_count(self) -> int:
+        """获取总记录数"""
+        result = await self.session.execute(self._count_query())
         return result.scalar()
 
-    async def get_items(self) -> list[T]:
-        """获取分页数据"""
-        query = select(self.model)
-
-        # 应用过滤器
-        if self.filters:
-            conditions = []
-            for field, value in self.filters.items():
-                if hasattr(self.model, field):
-                    column = getattr(self.model, field)
-                    if isinstance(value, str) and '%' in value:
-                        conditions.append(column.ilike(value))
-                    else:
-                        conditions.append(column == value)
-
-            if conditions:
-                query = query.where(and_(*conditions))
-
-        # 应用排序
-        if self.sort_by and hasattr(self.model, self.sort_by):
-            column = getattr(self.model, self.sort_by)
-            if self.sort_order == "desc":
-                query = query.order_by(column.desc())
-            else:
-                query = query.order_by(column.asc())
-        else:
-            # 默认按创建时间排序
-            if hasattr(self.model, 'created_at'):
-                query = query.order_by(self.model.created_at.desc())
+    async def _count_in_new_session(self) -> int:
+        """在独立会话（独立连接）上计数，可与分页查询并发执行"""
+        async with self.session_factory() as session:
+            return await session.scalar(self._count_query())
+
+    def _page_query(self, query):
+        """为查询追加过滤、排序、分页和加载选项"""
+        if self.options:
+            query = query.options(*self.options)
+        if self.where is not None:
+            query = query.where(self.where)
+
+        # 应用排序，以 id 作为次要排序键保证顺序稳定
+        keys = [
+            column
+            for column in (self.order_column, self.columns.get("id"))
+            if column is not None
+        ]
+        query = query.order_by(
+            *(key.desc() if self.descending else key.asc() for key in keys)
+        )
+
+        # 游标分页：多取一条用于判断是否还有下一页
+        if self.cursor is not None:
+            return query.where(self._cursor_condition()).limit(self.size + 1)
 
         # 应用分页
         offset = (self.page - 1) * self.size
-        query = query.offset(offset).limit(self.size)
+        return query.offset(offset).limit(self.size)
+
+    def _cursor_condition(self):
+        """位于游标之后的记录"""
+        if self.cursor_id is not None:
+            left = tuple_(self.order_column, self.columns["id"])
+            right = tuple_(self.cursor, self.cursor_id)
+        else:
+            left, right = self.order_column, self.cursor
+        return left < right if self.descending else left > right
+
+    async def get_items(self) -> list[T]:
+        """获取分页数据"""
+        query = self._page_query(select(self.model))
 
         result = await self.session.execute(query)
         return result.scalars().all()
 
     async def paginate(self) -> dict[str, Any]:
         """执行分页查询"""
-        total = await self.get_total_count()
-        items = await self.get_items()
+        if self.cursor is not None:
+            items = await self.get_items()
+            has_next = len(items) > self.size
+            return self._build_result(items[: self.size], None, has_next)
+
+        if settings.database.pagination_concurrent_count:
+            # 计数与分页查询分别占用一个连接并发执行，耗时取两者较大值
+            total, items = await asyncio.gather(
+                self._count_in_new_session(), self.get_items()
+            )
+            return self._build_result(items, total)
+
+        # 总数通过窗口函数随分页数据一并返回，只需一次查询
+        query = self._page_query(
+            select(self.model, func.count().over().label("_total"))
+        )
+        rows = (await self.session.execute(query)).all()
 
+        if rows:
+            total = rows[0]._total
+            items = [row[0] for row in rows]
+        elif self.page == 1:
+            total, items = 0, []
+        else:
+            # 页码超出范围时窗口函数没有行可返回，单独计数
+            total, items = await self.get_total_count(), []
+
+        return self._build_result(items, total)
+
+    def _build_result(
+        self, items: list[T], total: int | None, has_next: bool | None = None
+    ) -> dict[str, Any]:
+        """组装分页数据和元数据
+
+        游标分页不计算总数，total 为 None，has_next 由多取的一条记录判断
+        """
         # 计算分页元数据
-        pages = ceil(total / self.size) if total > 0 else 0
-        has_next = self.page < pages
-        has_prev = self.page > 1
+        if total is None:
+            pages = None
+            has_prev = True
+        else:
+            pages = ceil(total / self.size) if total > 0 else 0
+            has_next = self.page < pages
+            has_prev = self.page > 1
+
+        # 按创建时间排序时返回下一页游标，客户端可由此切换到游标分页
+        next_cursor = next_cursor_id = None
+        if (
+            has_next
+            and items
+            and self.order_column is not None
+            and self.order_column.key == "created_at"
+        ):
+            next_cursor = items[-1].created_at
+            next_cursor_id = items[-1].id
 
         meta = PaginationMeta(
             page=self.page,
@@ -120,7 +240,9 @@ async def paginate(self) -> dict[str, Any]:
             total=total,
             pages=pages,
             has_next=has_next,
-            has_prev=has_prev
+            has_prev=has_prev,
+            next_cursor=next_cursor,
+            next_cursor_id=next_cursor_id
         )
 
         return {
@@ -138,10 +260,11 @@ def build_search_filters(model: type[T], search_term: str, search_fields: list[s
         if not search_term or not search_fields:
             return []
 
+        columns = _column_map(model)
         conditions = []
         for field in search_fields:
-            if hasattr(model, field):
-                column = getattr(model, field)
+            column = columns.get(field)
+            if column is not None:
                 conditions.append(column.ilike(f"%{search_term}%"))
 
         return [or_(*conditions)] if conditions else []
@@ -149,10 +272,10 @@ def build_search_filters(model: type[T], search_term: str, search_fields: list[s
     @staticmethod
     def build_range_filters(model: type[T], field: str, min_val: Any, max_val: Any) -> list[Any]:
         """构建范围过滤器"""
-        if not hasattr(model, field):
+        column = _column_map(model).get(field)
+        if column is None:
             return []
 
-        column = getattr(model, field)
         conditions = []
 
         if min_val is not None:
@@ -166,11 +289,12 @@ def build_range_filters(model: type[T], field: str, min_val: Any, max_val: Any)
     @staticmethod
     def build_exact_filters(model: type[T], filters: dict[str, Any]) -> list[Any]:
         """构建精确匹配过滤器"""
+        columns = _column_map(model)
         conditions = []
 
         for field, value in filters.items():
-            if hasattr(model, field) and value is not None:
-                column = getattr(model, field)
+            column = columns.get(field)
+            if column is not None and value is not None:
                 conditions.append(column == value)
 
         return conditions
@@ -182,11 +306,9 @@ class SortBuilder:
     @staticmethod
     def build_sort_clause(model: type[T], sort_by: str, sort_order: str = "asc"):
         """构建排序子句"""
-        if not hasattr(model, sort_by):
-            # 默认按 ID 排序
-            sort_by = "id"
-
-        column = getattr(model, sort_by)
+        columns = _column_map(model)
+        # 无效字段默认按 ID 排序
+        column = columns.get(sort_by, columns["id"])
 
         if sort_order.lower() == "desc":
             return column.desc()
@@ -201,9 +323,8 @@ class QueryParams(BaseModel):
     search: str | None = Query(None, description="搜索关键词")
     sort_by: str | None = Query(None, description="排序字段")
     sort_order: str = Query("asc", pattern="^(asc|desc)$", description="排序方向")
-
-    class Config:
-        extra = "allow"
+    cursor: datetime | None = Query(None, description="游标（上一页返回的 next_cursor）")
+    cursor_id: UUID | None = Query(None, description="游标 ID（上一页返回的 next_cursor_id）")
 
 
 async def get_paginated_results(
@@ -215,9 +336,23 @@ async def get_paginated_results(
     sort_by: str | None = None,
     sort_order: str = "asc",
     search_term: str | None = None,
-    search_fields: list[str] | None = None
+    search_fields: list[str] | None = None,
+    conditions: list[Any] | None = None,
+    options: list[ExecutableOption] | None = None,
+    cursor: datetime | None = None,
+    cursor_id: UUID | None = None,
+    allowed_sort_fields: frozenset[str] | None = None,
+    session_factory: async_sessionmaker[AsyncSession] | None = None
 ) -> dict[str, Any]:
-    """获取分页结果"""
+    """获取分页结果
+
+    Args:
+        conditions: 额外的 SQLAlchemy 过滤表达式，与其他过滤条件以 AND 组合
+        options: 查询选项，如 ``selectinload(Model.rel)`` 预加载关系
+        cursor: 游标分页的起点，设置后按 (created_at, id) 定位而不使用页码偏移
+        allowed_sort_fields: 允许的排序字段，不在其中的 sort_by 返回 422
+        session_factory: 开启并发计数时 COUNT 使用的会话工厂，默认为应用的会话工厂
+    """
 
     # 构建过滤器
     filter_conditions = {}
@@ -226,12 +361,14 @@ async def get_paginated_results(
     if filters:
         filter_conditions.update(filters)
 
+    # 构建表达式过滤器
+    extra_conditions = list(conditions or [])
+
     # 添加搜索过滤器
     if search_term and search_fields:
-        search_conditions = FilterBuilder.build_search_filters(model, search_term, search_fields)
-        if search_conditions:
-            # 这里可以更复杂地处理搜索条件
-            pass
+        extra_conditions.extend(
+            FilterBuilder.build_search_filters(model, search_term, search_fields)
+        )
 
     paginator = Paginator(
         session=session,
@@ -240,7 +377,13 @@ async def get_paginated_results(
         size=size,
         filters=filter_conditions,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        conditions=extra_conditions,
+        options=options,
+        cursor=cursor,
+        cursor_id=cursor_id,
+        allowed_sort_fields=allowed_sort_fields,
+        session_factory=session_factory
     )
 
     return await paginator.paginate()
@@ -3,16 +3,21 @@
 数据库迁移管理脚本
 """
 
-import os
+import asyncio
 import sys
-import subprocess
 from pathlib import Path
 
+from alembic import command as alembic_command
+from alembic.util import CommandError
+from sqlalchemy.exc import SQLAlchemyError
+
 # 添加项目根目录到 Python 路径
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from app.core.config import settings
+from app.database.migrations import get_alembic_config, is_at_head, run_alembic
+from app.database.session import engine
 
 
 def get_database_url():
@@ -20,42 +25,83 @@ def get_database_url():
     return settings.database_url
 
 
-def run_alembic_command(command, description=None):
-    """运行 Alembic 命令"""
+# Alembic 配置只解析一次，所有命令在当前进程内复用
+_CFG = get_alembic_config()
+_CFG.set_main_option('sqlalchemy.url', get_database_url())
+
+# 命令名到 Alembic 编程接口的映射
+_COMMANDS = {
+    'upgrade': alembic_command.upgrade,
+    'downgrade': alembic_command.downgrade,
+    'revision': alembic_command.revision,
+    'history': alembic_command.history,
+    'current': alembic_command.current,
+    'show': alembic_command.show,
+    'stamp': alembic_command.stamp,
+    'init': alembic_command.init,
+}
+
+# 需要连接数据库的命令（revision 仅在 autogenerate 时需要）
+_ONLINE_COMMANDS = {'upgrade', 'downgrade', 'current', 'stamp'}
+
+# 修改 alembic_version 的命令，执行前获取迁移锁
+_MUTATING_COMMANDS = {'upgrade', 'downgrade', 'stamp'}
+
+
+async def _run_online(command_fn, lock=False, **kwargs):
+    """在应用异步引擎的连接上执行命令，结束后释放连接池"""
+    try:
+        return await run_alembic(engine, _CFG, command_fn, lock=lock, **kwargs)
+    finally:
+        await engine.dispose()
+
+
+async def _upgrade_head():
+    """已处于最新版本时直接返回，否则加锁执行 upgrade head"""
+    try:
+        if await is_at_head(engine, _CFG):
+            print("\033[1;34m[INFO]\033[0m Already at head, skipping")
+            return
+        await run_alembic(engine, _CFG, alembic_command.upgrade, lock=True, revision='head')
+    finally:
+        await engine.dispose()
+
+
+def run_alembic_command(command, description=None, **kwargs):
+    """在当前进程内运行 Alembic 命令"""
     if description:
         print(f"\033[1;34m[INFO]\033[0m {description}")
-    
-    env = os.environ.copy()
-    env['DATABASE_URL'] = get_database_url()
-    
+
     try:
-        result = subprocess.run(
-            ['alembic'] + command,
-            env=env,
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        if result.stdout:
-            print(result.stdout)
+        command_fn = _COMMANDS[command]
+        if command in _ONLINE_COMMANDS or kwargs.get('autogenerate'):
+            asyncio.run(
+                _run_online(command_fn, lock=command in _MUTATING_COMMANDS, **kwargs)
+            )
+        else:
+            command_fn(_CFG, **kwargs)
         return True
-    except subprocess.CalledProcessError as e:
+    except (CommandError, SQLAlchemyError, OSError) as e:
         print(f"\033[1;31m[ERROR]\033[0m Command failed: {e}")
-        if e.stdout:
-            print("STDOUT:", e.stdout)
-        if e.stderr:
-            print("STDERR:", e.stderr)
         return False
 
 
 def migrate_up():
     """运行迁移到最新版本"""
-    return run_alembic_command(['upgrade', 'head'], "Running database migrations...")
+    print("\033[1;34m[INFO]\033[0m Running database migrations...")
+    try:
+        asyncio.run(_upgrade_head())
+        return True
+    except (CommandError, SQLAlchemyError, OSError) as e:
+        print(f"\033[1;31m[ERROR]\033[0m Command failed: {e}")
+        return False
 
 
 def migrate_down(revision='-1'):
     """回滚迁移"""
-    return run_alembic_command(['downgrade', revision], f"Rolling back to revision {revision}...")
+    return run_alembic_command(
+        'downgrade', f"Rolling back to revision {revision}...", revision=revision
+    )
 
 
 def migrate_create(name, autogenerate=True):
@@ -64,41 +110,50 @@ def migrate_create(name, autogenerate=True):
         print("\033[1;31m[ERROR]\033[0m Migration name is required")
         return False
     
-    cmd = ['revision', '-m', name]
-    if autogenerate:
-        cmd.append('--autogenerate')
-    
-    return run_alembic_command(cmd, f"Creating migration: {name}")
+    return run_alembic_command(
+        'revision', f"Creating migration: {name}", message=name, autogenerate=autogenerate
+    )
 
 
 def migrate_history():
     """显示迁移历史"""
-    return run_alembic_command(['history', '--verbose'], "Showing migration history...")
+    return run_alembic_command('history', "Showing migration history...", verbose=True)
 
 
 def migrate_current():
     """显示当前迁移状态"""
-    return run_alembic_command(['current'], "Showing current migration...")
+    return run_alembic_command('current', "Showing current migration...")
 
 
 def migrate_show():
     """显示迁移状态"""
-    return run_alembic_command(['show'], "Showing migration status...")
+    return run_alembic_command('show', "Showing migration status...", rev='head')
+
+
+def migrate_status_all():
+    """依次显示迁移历史、当前版本和最新版本详情
+
+    三个只读命令在同一进程内共用一份配置，只有 current 需要连接数据库
+    """
+    results = [migrate_history(), migrate_current(), migrate_show()]
+    return all(results)
 
 
 def migrate_init():
     """初始化迁移环境"""
-    return run_alembic_command(['init', 'alembic'], "Initializing migration environment...")
+    return run_alembic_command(
+        'init', "Initializing migration environment...", directory='alembic'
+    )
 
 
 def migrate_stamp(revision='head'):
     """标记数据库版本"""
-    return run_alembic_command(['stamp', revision], f"Stamping database to revision {revision}...")
+    return run_alembic_command(
+        'stamp', f"Stamping database to revision {revision}...", revision=revision
+    )
 
 
-def show_help():
-    """显示帮助信息"""
-    print("""
+_HELP_TEXT = """
 Database Migration Management Script
 
 Usage: python migrate.py [command] [options]
@@ -111,6 +166,7 @@ def show_help():
   history               Show migration history
   current               Show current migration status
   show                  Show migration status
+  status-all            Show history, current and head revision in one run
   init                  Initialize migration environment
   stamp [revision]      Stamp database to revision (default: head)
   help                  Show this help message
@@ -121,7 +177,33 @@ def show_help():
   python migrate.py create "add_user_table"
   python migrate.py create-manual "custom_migration"
   python migrate.py stamp head
-""")
+"""
+
+
+def show_help():
+    """显示帮助信息"""
+    print(_HELP_TEXT)
+
+
+def _arg(args, default=None):
+    """取第一个位置参数"""
+    return args[0] if args else default
+
+
+# 命令行命令到处理函数的映射，处理函数接收命令之后的参数列表
+_DISPATCH = {
+    'up': lambda args: migrate_up(),
+    'down': lambda args: migrate_down(_arg(args, '-1')),
+    'create': lambda args: migrate_create(_arg(args)),
+    'create-manual': lambda args: migrate_create(_arg(args), autogenerate=False),
+    'history': lambda args: migrate_history(),
+    'current': lambda args: migrate_current(),
+    'show': lambda args: migrate_show(),
+    'status-all': lambda args: migrate_status_all(),
+    'init': lambda args: migrate_init(),
+    'stamp': lambda args: migrate_stamp(_arg(args, 'head')),
+    'help': lambda args: show_help(),
+}
 
 
 def main():
@@ -129,36 +211,15 @@ def main():
     if len(sys.argv) < 2:
         show_help()
         return
-    
+
     command = sys.argv[1]
-    
-    if command == 'up':
-        migrate_up()
-    elif command == 'down':
-        revision = sys.argv[2] if len(sys.argv) > 2 else '-1'
-        migrate_down(revision)
-    elif command == 'create':
-        name = sys.argv[2] if len(sys.argv) > 2 else None
-        migrate_create(name)
-    elif command == 'create-manual':
-        name = sys.argv[2] if len(sys.argv) > 2 else None
-        migrate_create(name, autogenerate=False)
-    elif command == 'history':
-        migrate_history()
-    elif command == 'current':
-        migrate_current()
-    elif command == 'show':
-        migrate_show()
-    elif command == 'init':
-        migrate_init()
-    elif command == 'stamp':
-        revision = sys.argv[2] if len(sys.argv) > 2 else 'head'
-        migrate_stamp(revision)
-    elif command == 'help':
-        show_help()
-    else:
+    handler = _DISPATCH.get(command)
+    if handler is None:
         print(f"\033[1;31m[ERROR]\033[0m Unknown command: {command}")
         show_help()
+        return
+
+    handler(sys.argv[2:])
 
 
 if __name__ == '__main__':
@@ -1,57 +1,125 @@
+import os
+from functools import partial
+
+# 测试环境使用最低的密码哈希开销（仅限测试，生产保持默认值），需在加载配置之前设置
+os.environ.setdefault("SECURITY_ARGON2_MEMORY_COST", "1024")
+os.environ.setdefault("SECURITY_ARGON2_TIME_COST", "1")
+os.environ.setdefault("SECURITY_BCRYPT_ROUNDS", "4")
+
 import pytest
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from app.core.config import settings
-from app.database.session import Base, get_db
+from alembic import command
+from app.database.migrations import get_alembic_config, run_alembic
+from app.database.session import get_db, get_session_factory
 from app.main import app
 
-# 测试数据库 URL
-TEST_DATABASE_URL = settings.test_database_url
+# 测试数据库 URL：默认使用内存 SQLite，CI 可通过环境变量指向真实的 PostgreSQL
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
 
 # 创建测试数据库引擎
-engine = create_async_engine(TEST_DATABASE_URL, echo=False)
-TestingSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+if TEST_DATABASE_URL:
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+else:
+    # 内存数据库只存在于单个连接中，StaticPool 让所有会话共用这一个连接
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        echo=False,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """创建事件循环"""
-    import asyncio
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+    # pysqlite 自行管理事务，SAVEPOINT 无法正常工作，改为由 SQLAlchemy 显式发出 BEGIN
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transaction(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+TestingSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 @pytest.fixture(scope="session")
 async def test_db():
-    """创建测试数据库"""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    yield
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    """按迁移脚本创建测试数据库，返回测试引擎"""
+    config = get_alembic_config(configure_logger=False)
+    await run_alembic(engine, config, command.upgrade, revision="head")
+    yield engine
+    await run_alembic(engine, config, command.downgrade, revision="base")
+    # 关闭连接，否则 aiosqlite 的后台线程会阻止进程退出
+    await engine.dispose()
 
 @pytest.fixture
 async def db_session(test_db):
-    """创建数据库会话"""
-    async with TestingSessionLocal() as session:
-        yield session
-        await session.rollback()
+    """创建数据库会话
 
-@pytest.fixture
-def client(db_session):
-    """创建测试客户端"""
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    会话加入连接上的外层事务，接口中的 commit 只提交 SAVEPOINT，
+    测试结束后回滚外层事务，数据不会残留到下一个测试
+    """
+    async with test_db.connect() as conn:
+        trans = await conn.begin()
+        async with AsyncSession(
+            bind=conn,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        ) as session:
+            yield session
+        await trans.rollback()
 
-    app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as c:
+@pytest.fixture
+async def client(db_session):
+    """创建测试客户端（直接调用 ASGI 应用，与数据库会话共用同一事件循环）"""
+    app.dependency_overrides[get_db] = lambda: db_session
+    # 流式响应自行打开的会话同样加入测试事务
+    app.dependency_overrides[get_session_factory] = lambda: partial(
+        AsyncSession,
+        bind=db_session.bind,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
         yield c
     app.dependency_overrides.clear()
 
+@pytest.fixture(scope="session")
+async def registered_user(test_db):
+    """整个测试会话共用的已注册用户，只注册和登录一次
+
+    返回登录接口的 data（含 access_token）以及注册时使用的 email、password
+    """
+    user_data = {
+        "email": "auth@example.com",
+        "username": "authuser",
+        "full_name": "Auth User",
+        "password": "TestPassword123",
+    }
+    async with TestingSessionLocal(bind=test_db) as session:
+        # 只替换 get_db，结束后恢复原有的覆盖
+        previous = app.dependency_overrides.get(get_db)
+        app.dependency_overrides[get_db] = lambda: session
+        transport = ASGITransport(app=app)
+        try:
+            async with AsyncClient(transport=transport, base_url="http://test") as c:
+                response = await c.post("/api/v1/auth/register", json=user_data)
+                assert response.status_code == 200, response.text
+                response = await c.post(
+                    "/api/v1/auth/login",
+                    json={"email": user_data["email"], "password": user_data["password"]},
+                )
+                assert response.status_code == 200, response.text
+        finally:
+            if previous is None:
+                app.dependency_overrides.pop(get_db, None)
+            else:
+                app.dependency_overrides[get_db] = previous
+    return {**response.json()["data"], **user_data}
+
 @pytest.fixture
 def test_user_data():
     """测试用户数据"""
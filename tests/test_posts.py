@@ -0,0 +1,200 @@
+import json
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.posts.models import Post
+
+POSTS_URL = "/api/v1/posts/"
+
+
+@pytest.fixture
+def auth_headers(registered_user):
+    """会话共用用户的认证头"""
+    return {"Authorization": f"Bearer {registered_user['access_token']}"}
+
+
+@pytest.fixture
+async def other_headers(client: AsyncClient):
+    """另一个用户的认证头（注册在当前测试的事务中）"""
+    user_data = {
+        "email": "other@example.com",
+        "username": "otheruser",
+        "password": "TestPassword123",
+    }
+    response = await client.post("/api/v1/auth/register", json=user_data)
+    assert response.status_code == 200, response.text
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": user_data["email"], "password": user_data["password"]},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+
+async def create_post(client: AsyncClient, headers, **overrides):
+    """创建文章并返回响应数据"""
+    payload = {
+        "title": "Test Post",
+        "content": "This is a test post content",
+        "slug": "test-post",
+        "is_published": True,
+        **overrides,
+    }
+    response = await client.post(POSTS_URL, json=payload, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+class TestPostVisibility:
+    """文章可见性测试"""
+
+    async def test_published_post_visible_to_others(
+        self, client: AsyncClient, auth_headers, other_headers
+    ):
+        """测试已发布文章对其他用户可见"""
+        post = await create_post(client, auth_headers)
+        response = await client.get(f"{POSTS_URL}{post['id']}", headers=other_headers)
+        assert response.status_code == 200
+        assert response.json()["data"]["slug"] == "test-post"
+
+    async def test_unpublished_post_hidden_from_others(
+        self, client: AsyncClient, auth_headers, other_headers
+    ):
+        """测试未发布文章只有作者可见"""
+        post = await create_post(client, auth_headers, is_published=False)
+        url = f"{POSTS_URL}{post['id']}"
+
+        response = await client.get(url, headers=other_headers)
+        assert response.status_code == 403
+
+        response = await client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+
+    async def test_missing_post(self, client: AsyncClient, auth_headers):
+        """测试文章不存在"""
+        response = await client.get(
+            f"{POSTS_URL}00000000-0000-0000-0000-000000000000", headers=auth_headers
+        )
+        assert response.status_code == 404
+
+    async def test_deleted_post_hidden(
+        self, client: AsyncClient, db_session: AsyncSession, auth_headers
+    ):
+        """测试删除为软删除，已删除的文章不再出现在查询中"""
+        post = await create_post(client, auth_headers)
+        response = await client.delete(f"{POSTS_URL}{post['id']}", headers=auth_headers)
+        assert response.status_code == 200
+
+        # 模拟新的请求，不从会话的标识映射中取回已删除的对象
+        db_session.expunge_all()
+        response = await client.get(f"{POSTS_URL}{post['id']}", headers=auth_headers)
+        assert response.status_code == 404
+        response = await client.get(f"{POSTS_URL}my/posts", headers=auth_headers)
+        assert response.json()["data"]["items"] == []
+
+        deleted = await db_session.get(
+            Post, UUID(post["id"]), execution_options={"include_deleted": True}
+        )
+        assert deleted.is_deleted is True
+
+
+class TestPostPagination:
+    """文章列表分页测试"""
+
+    async def test_cursor_pagination(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        auth_headers,
+        registered_user,
+    ):
+        """测试按 next_cursor 翻页：不重复、不遗漏，同一时间戳按 id 区分"""
+        created = {
+            (await create_post(client, auth_headers, slug=f"post-{i}"))["id"]
+            for i in range(3)
+        }
+        # 固定为同一创建时间，翻页只能依靠 id 区分
+        await db_session.execute(
+            update(Post)
+            .where(Post.id.in_([UUID(post_id) for post_id in created]))
+            .values(created_at=datetime(2026, 1, 1, tzinfo=UTC))
+        )
+        params = {
+            "size": 1,
+            "sort_order": "desc",
+            "author_id": registered_user["user"]["id"],
+        }
+
+        response = await client.get(POSTS_URL, params=params, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        assert data["meta"]["total"] == 3
+        seen = [item["id"] for item in data["items"]]
+
+        while data["meta"]["has_next"]:
+            meta = data["meta"]
+            assert meta["next_cursor"] is not None
+            assert meta["next_cursor_id"] == seen[-1]
+            response = await client.get(
+                POSTS_URL,
+                params={
+                    **params,
+                    "cursor": meta["next_cursor"],
+                    "cursor_id": meta["next_cursor_id"],
+                },
+                headers=auth_headers,
+            )
+            assert response.status_code == 200, response.text
+            data = response.json()["data"]
+            # 游标分页不计算总数
+            assert data["meta"]["total"] is None
+            seen.extend(item["id"] for item in data["items"])
+
+        assert len(seen) == 3
+        assert set(seen) == created
+        # 创建时间相同，按 id 降序
+        assert seen == sorted(seen, reverse=True)
+        assert data["meta"]["next_cursor"] is None
+
+    async def test_cursor_requires_created_at_sort(
+        self, client: AsyncClient, auth_headers
+    ):
+        """测试游标分页只支持按创建时间排序"""
+        response = await client.get(
+            POSTS_URL,
+            params={"sort_by": "title", "cursor": "2026-01-01T00:00:00Z"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 422
+
+    async def test_invalid_sort_field(self, client: AsyncClient, auth_headers):
+        """测试不在白名单中的排序字段返回 422"""
+        response = await client.get(
+            POSTS_URL, params={"sort_by": "content"}, headers=auth_headers
+        )
+        assert response.status_code == 422
+        assert "Invalid sort field" in response.json()["error"]["message"]
+
+
+class TestPostExport:
+    """文章导出测试"""
+
+    async def test_export_my_posts(
+        self, client: AsyncClient, auth_headers, other_headers
+    ):
+        """测试以 NDJSON 导出自己的全部文章，不含他人的文章"""
+        for i in range(2):
+            await create_post(client, auth_headers, slug=f"mine-{i}")
+        await create_post(client, other_headers, slug="theirs")
+
+        response = await client.get(f"{POSTS_URL}my/posts/export", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        posts = [json.loads(line) for line in response.text.splitlines()]
+        # SQLite 的创建时间只精确到秒，同一秒内的顺序由 id 决定
+        assert sorted(post["slug"] for post in posts) == ["mine-0", "mine-1"]
@@ -0,0 +1,48 @@
+import time
+
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    """进程内 TTL 缓存测试"""
+
+    def test_get_and_set(self):
+        """测试读写缓存"""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+        assert cache.get("missing") is None
+
+    def test_expired_entry(self):
+        """测试过期条目被淘汰"""
+        cache = TTLCache(maxsize=10)
+        cache.set("key", "value", expires_at=time.time() - 1)
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_maxsize(self):
+        """测试容量上限"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        assert len(cache) == 2
+        assert cache.get("a") is None
+        assert cache.get("c") == 3
+
+    def test_lru_eviction(self):
+        """测试淘汰最久未使用的条目"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    def test_disabled(self):
+        """测试容量为 0 时不缓存"""
+        cache = TTLCache(maxsize=0, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
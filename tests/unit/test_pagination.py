@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from alembic import command
+from app.auth.models import User
+from app.core.config import settings
+from app.database.migrations import get_alembic_config, run_alembic
+from app.utils.pagination import Paginator
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """文件 SQLite 引擎，每次取连接都会新建连接"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pagination.db'}", poolclass=NullPool
+    )
+    await run_alembic(
+        engine, get_alembic_config(configure_logger=False), command.upgrade, revision="head"
+    )
+    yield engine
+    await engine.dispose()
+
+
+class TestPaginator:
+    """分页器测试"""
+
+    async def test_concurrent_count(self, engine, monkeypatch):
+        """测试开启并发计数时，COUNT 使用工厂创建的新连接，而不是当前会话绑定的连接"""
+        monkeypatch.setattr(settings.database, "pagination_concurrent_count", True)
+        async with engine.connect() as conn:
+            session = AsyncSession(bind=conn, expire_on_commit=False)
+            session.add_all(
+                User(
+                    email=f"user{i}@example.com",
+                    username=f"user{i}",
+                    hashed_password="x",
+                )
+                for i in range(3)
+            )
+            await session.commit()
+
+            result = await Paginator(
+                session,
+                User,
+                page=1,
+                size=2,
+                session_factory=async_sessionmaker(engine),
+            ).paginate()
+            await session.close()
+
+        assert result["meta"].total == 3
+        assert result["meta"].pages == 2
+        assert len(result["items"]) == 2
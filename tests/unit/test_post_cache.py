@@ -0,0 +1,88 @@
+import time
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.redis import redis_cache
+from app.posts.cache import cache_post, get_cached_post, invalidate_post
+from app.posts.schemas import PostResponse
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def setex(self, key, timeout, value):
+        self.commands.append((key, timeout, value))
+
+    async def execute(self):
+        return [await self.client.set(k, v, ex=t) for k, t, v in self.commands]
+
+
+class _FakeRedis:
+    """支持 GET / SET EX NX / 管道 SETEX 的内存 Redis"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        value, expires_at = self.data.get(key, (None, 0))
+        return value if expires_at > time.time() else None
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and await self.get(key) is not None:
+            return None
+        self.data[key] = (value, time.time() + ex)
+        return True
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(redis_cache, "redis_client", fake)
+    return fake
+
+
+def _post(title="Title"):
+    return PostResponse(
+        id=uuid.uuid4(),
+        title=title,
+        content="content",
+        slug="slug",
+        author_id=uuid.uuid4(),
+        is_published=True,
+        created_at=datetime.now(UTC),
+    )
+
+
+class TestPostCache:
+    """文章缓存测试"""
+
+    async def test_cache_and_read(self, fake_redis):
+        """测试回填后可以读到缓存"""
+        post = _post()
+        assert await cache_post(post) is True
+        cached = await get_cached_post(post.id)
+        assert cached is not None
+        assert cached.title == post.title
+
+    async def test_stale_write_after_invalidation(self, fake_redis):
+        """测试失效之后到达的旧数据不会写回缓存"""
+        stale = _post("old")
+        await cache_post(stale)
+
+        # 读请求在更新前读到旧数据，更新提交并失效后才回填缓存
+        await invalidate_post(stale.id)
+        assert await cache_post(stale) is False
+        assert await get_cached_post(stale.id) is None